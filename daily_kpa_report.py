@@ -25,21 +25,35 @@ Structure: Critical items first, only shows sections with data
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import csv
 from datetime import datetime, timedelta
 import os
+import re
 import sys
-import smtplib
-from io import StringIO
+import zipfile
+from io import BytesIO, StringIO, TextIOWrapper
 from html import escape as html_escape
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from collections import Counter
+from docx.image.image import Image
+from docx.oxml.ns import nsdecls
+from docx.oxml import parse_xml
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice, repeat
+
+# _save_docx's level-1 writer uses this python-docx internal; without it
+# (a python-docx release that moved it) saves fall back to Document.save
+try:
+    from docx.opc.pkgwriter import _ContentTypesItem
+except ImportError:
+    _ContentTypesItem = None
 
 # ==============================================================================
 # SETUP - API keys from environment variables
@@ -52,6 +66,15 @@ if not API_TOKEN:
 
 MOTIVE_API_KEY = os.environ.get("MOTIVE_API_KEY", "")
 
+# Email delivery; send_email_report skips sending when any of these is unset
+GMAIL_ADDRESS = os.environ.get("GMAIL_ADDRESS", "")
+GMAIL_APP_PASSWORD = os.environ.get("GMAIL_APP_PASSWORD", "")
+REPORT_RECIPIENT = os.environ.get("REPORT_RECIPIENT", "")
+
+# Optional directory for caching each form's CSV per report day, so re-runs
+# (local iteration, CI retries) skip the API; unset means always pull live
+KPA_CACHE_DIR = os.environ.get("KPA_CACHE_DIR", "")
+
 API_BASE = "https://api.kpaehs.com/v1"
 
 FORMS = {
@@ -90,10 +113,58 @@ COLORS = {
     'safe': RGBColor(0, 128, 0),
 }
 
+# Lengths are immutable ints, so the python-docx helpers can share these
+PT_8, PT_9, PT_12, PT_14, PT_18 = Pt(8), Pt(9), Pt(12), Pt(14), Pt(18)
+PAGE_MARGIN = Inches(0.75)
+LOGO_WIDTH = Inches(1.0)
+
 # Logos are optional - they exist on local machines but not on CI runners
 LOGOS_PATH = os.path.expanduser("~/Downloads")
 LOGOS = ['Butchs.jpg', 'ButchTrucking.jpg', 'Permian.jpg', 'Hutchs.png', 'Transcend.jpg', 'Valor.jpg']
 
+
+def _index_logos():
+    """Map filename -> path for everything in LOGOS_PATH (empty if it's missing)"""
+    try:
+        with os.scandir(LOGOS_PATH) as entries:
+            return {entry.name: entry.path for entry in entries if entry.is_file()}
+    except OSError:
+        return {}
+
+
+def _read_logo(path):
+    """Logo file contents, or None (with a warning) if it can't be read or placed"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        print(f"Warning: Skipping logo {path}: {e}")
+        return None
+    # Logos are optional: a truncated or corrupt file is dropped here rather
+    # than failing add_picture (and the whole report) on every build
+    try:
+        Image.from_blob(data)
+    except Exception as e:
+        print(f"Warning: Skipping logo {path}: {str(e) or type(e).__name__}")
+        return None
+    return data
+
+
+def _load_logos():
+    """Read the LOGOS present in LOGOS_PATH, leaving out any that can't be read or placed"""
+    logo_bytes = {}
+    for filename in LOGOS:
+        if filename in _LOGO_INDEX:
+            data = _read_logo(_LOGO_INDEX[filename])
+            if data is not None:
+                logo_bytes[filename] = data
+    return logo_bytes
+
+
+# Scanned and read once at import so each report build adds pictures from memory
+_LOGO_INDEX = _index_logos()
+_LOGO_BYTES = _load_logos()
+
 # Assessment/Audit forms with metadata for deep analysis
 ASSESSMENT_FORMS = {
     381707: {"name": "CSG - Safety Casing Field Assessment", "type": "Field Assessment", "division": "Casing"},
@@ -109,6 +180,10 @@ ASSESSMENT_FORMS = {
 
 KPA_RESPONSE_URL = "https://brhas-ees.kpaehs.com/forms/responses/view"
 
+# Date stamps shown in the report header (Word and HTML)
+REPORT_DATE_FMT = '%A, %B %d, %Y'
+GENERATED_FMT = '%B %d, %Y at %H:%M:%S'
+
 # Keywords for smart field detection in assessment CSV headers
 COMPLIANCE_KEYWORDS = ['compliance', 'rating', 'satisfactory', 'pass', 'fail', 'acceptable',
                        'result', 'score', 'compliant', 'conformance']
@@ -117,19 +192,36 @@ FINDING_KEYWORDS = ['issue', 'finding', 'non-conformance', 'corrective', 'defici
                     'note', 'detail']
 YARD_KEYWORDS = ['yard', 'location', 'site', 'field office', 'facility', 'area']
 
+# Observation types that stay open until a corrective action is recorded
+PENDING_TYPES = frozenset(('At-Risk Condition', 'At-Risk Procedure'))
+
 # ==============================================================================
 # API CALL
 # ==============================================================================
 
-def call_kpa(endpoint, params):
-    """Make request to KPA API"""
+# One pooled session for every KPA call: the concurrent form pulls share warm
+# connections, and transient gateway errors get a couple of retries.
+# responses.flat is a read, so retrying its POST is safe.
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=len(FORMS), pool_maxsize=len(FORMS),
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+                      allowed_methods=None, raise_on_status=False)))
+
+
+def call_kpa(endpoint, params, stream=False):
+    """Make request to KPA API
+
+    With stream, the open response is returned (the caller closes it) instead
+    of the fully read body text.
+    """
     url = f"{API_BASE}/{endpoint}"
     payload = {"token": API_TOKEN}
     payload.update(params)
 
     try:
-        response = requests.post(url, json=payload, timeout=30)
-        return response.text
+        response = SESSION.post(url, json=payload, timeout=30, stream=stream)
+        return response if stream else response.text
     except Exception as e:
         print(f"ERROR: {e}")
         return None
@@ -139,53 +231,144 @@ def call_kpa(endpoint, params):
 # PULL FORM DATA - YESTERDAY ONLY
 # ==============================================================================
 
-def pull_form_data(form_id, form_name):
-    """Pull incidents from YESTERDAY ONLY"""
-    today = datetime.now()
-    yesterday_start = today.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
-    today_start = today.replace(hour=0, minute=0, second=0, microsecond=0)
+def _parse_kpa_datetime(date_str):
+    """Parse a KPA 'YYYY-MM-DD HH:MM:SS' timestamp, raising ValueError like strptime"""
+    s = date_str
+    # Fixed-width fast path; anything else goes through strptime for its exact rules
+    if len(s) == 19 and s[4] == '-' and s[7] == '-' and s[10] == ' ' and s[13] == ':' and s[16] == ':':
+        return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                        int(s[11:13]), int(s[14:16]), int(s[17:19]))
+    return datetime.strptime(s, '%Y-%m-%d %H:%M:%S')
 
-    yesterday_start_ms = int(yesterday_start.timestamp() * 1000)
-    today_start_ms = int(today_start.timestamp() * 1000)
+
+def _yesterday_window(now=None):
+    """Yesterday's [start, end) bounds as datetimes, API cursor (ms) and CSV-format strings"""
+    today_start = (now or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    yesterday_start = today_start - timedelta(days=1)
+    return {
+        'start': yesterday_start,
+        'end': today_start,
+        'start_ms': int(yesterday_start.timestamp() * 1000),
+        'start_str': yesterday_start.strftime('%Y-%m-%d %H:%M:%S'),
+        'end_str': today_start.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+
+def pull_form_data(form_id, form_name, window=None):
+    """Pull incidents from YESTERDAY ONLY
+
+    window is a _yesterday_window() result; main computes it once for all forms.
+    """
+    if window is None:
+        window = _yesterday_window()
 
     params = {
         "form_id": form_id,
         "format": "csv",
-        "updated_after": yesterday_start_ms
+        "updated_after": window['start_ms']
     }
 
-    csv_text = call_kpa("responses.flat", params)
+    cache_path = None
+    if KPA_CACHE_DIR:
+        cache_path = os.path.join(KPA_CACHE_DIR, f"{form_id}_{window['start'].strftime('%Y-%m-%d')}.csv")
+        try:
+            with open(cache_path, encoding='utf-8', newline='') as f:
+                return _parse_form_csv(f, form_name, window)
+        except OSError:
+            pass
 
-    if not csv_text or csv_text.strip() == "":
+    response = call_kpa("responses.flat", params, stream=True)
+    if response is None:
         return None
 
+    with response:
+        # KPA serves UTF-8 CSV, often without a charset (which requests would
+        # read as ISO-8859-1 for text/*, or sniff the whole body for); -sig also
+        # drops a leading BOM so it can't end up in the first header name
+        encoding = 'utf-8-sig'
+        if cache_path and response.ok:
+            try:
+                text = response.content.decode(encoding, errors='replace')
+            except requests.RequestException as e:
+                print(f"ERROR: {e}")
+                return None
+            result = _parse_form_csv(StringIO(text), form_name, window)
+            # Only a body that parsed is kept; an error page or empty body
+            # would otherwise be replayed instead of re-pulled
+            if result is not None:
+                _write_csv_cache(cache_path, text)
+            return result
+
+        # Decode (leniently, as response.text does) and parse as the body arrives
+        # instead of building response.text and a StringIO copy of it
+        raw = response.raw
+        raw.decode_content = True
+        # urllib3 closes the stream at EOF by default, which TextIOWrapper reports as an error
+        raw.auto_close = False
+        text = TextIOWrapper(raw, encoding=encoding, errors='replace', newline='')
+        return _parse_form_csv(text, form_name, window)
+
+
+def _write_csv_cache(path, text):
+    """Store a responses.flat body under KPA_CACHE_DIR; a failed write only loses the cache"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: could not cache {path}: {e}")
+
+
+def _parse_form_csv(text, form_name, window):
+    """Filter a responses.flat CSV text stream down to the rows inside window"""
+    yesterday_start = window['start']
+    today_start = window['end']
+    window_start = window['start_str']
+    window_end = window['end_str']
+
     try:
-        csv_file = StringIO(csv_text)
-        reader = csv.DictReader(csv_file)
-        rows = list(reader)
-        if len(rows) == 0:
+        # Plain reader: only rows inside the window are turned into dicts; an
+        # empty body simply has no header row
+        reader = csv.reader(text)
+        headers = next(reader, None)
+        if not headers or 'date' not in headers:
             return None
+        # Interned keys let every row dict's .get('date') etc. match on identity
+        headers = [sys.intern(h) for h in headers]
+        n_cols = len(headers)
+        date_idx = headers.index('date')
+        report_idx = headers.index('report number') if 'report number' in headers else None
 
         filtered_rows = []
-        for row in rows:
-            if row.get('report number') == 'Report Number':
+        for row in reader:
+            if not row:
+                continue
+            if report_idx is not None and report_idx < len(row) and row[report_idx] == 'Report Number':
                 continue
 
-            date_str = row.get('date', '')
+            date_str = row[date_idx] if date_idx < len(row) else ''
+            # Full-width timestamps sort chronologically, so rows from other days
+            # are dropped on two string compares before anything is parsed
+            if len(date_str) == 19 and not (window_start <= date_str < window_end):
+                continue
             try:
-                row_date = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-                row_date_ms = int(row_date.timestamp() * 1000)
-
-                if yesterday_start_ms <= row_date_ms < today_start_ms:
-                    filtered_rows.append(row)
+                row_date = _parse_kpa_datetime(date_str)
             except:
                 continue
 
+            if yesterday_start <= row_date < today_start:
+                # Short rows get None for the missing columns, as DictReader did
+                if len(row) < n_cols:
+                    row += [None] * (n_cols - len(row))
+                filtered_rows.append(dict(zip(headers, row)))
+
         if len(filtered_rows) == 0:
             return None
 
         return {
-            'headers': reader.fieldnames if reader.fieldnames else [],
+            'headers': headers,
             'rows': filtered_rows,
             'count': len(filtered_rows)
         }
@@ -194,6 +377,17 @@ def pull_form_data(form_id, form_name):
         return None
 
 
+def pull_all_forms(window=None):
+    """Pull every form in FORMS for the same window, returning results in FORMS order.
+
+    The pulls are network-bound, so they run side by side over the shared SESSION.
+    """
+    if window is None:
+        window = _yesterday_window()
+    with ThreadPoolExecutor(max_workers=len(FORMS)) as pool:
+        return list(pool.map(pull_form_data, FORMS.keys(), FORMS.values(), repeat(window)))
+
+
 # ==============================================================================
 # HELPERS - GET ACTUAL OBSERVER NAME (NOT DATA ENTRY PERSON)
 # ==============================================================================
@@ -208,21 +402,30 @@ def get_actual_observer_name(obs):
     For paper forms submitted by James Barnett:
     - 'observer' field = James Barnett (system entry person - IGNORE)
     - 'Name' or 'name' field = Ruben Lopez, Alfonso Orozco, etc. (ACTUAL person - USE THIS)
+
+    Resolved once per row; the result is kept on the row under '_observer'.
     """
+    name = obs.get('_observer')
+    if name is None:
+        name = obs['_observer'] = _lookup_observer_name(obs)
+    return name
+
 
+def _lookup_observer_name(obs):
+    """Name/name/observer fallback chain behind get_actual_observer_name"""
     # PRIMARY: Check 'Name' field (capital N)
-    name = obs.get('Name', '').strip()
-    if name and name.lower() not in ['none', 'unknown', '']:
+    name = (obs.get('Name') or '').strip()
+    if name and name.lower() not in {'none', 'unknown', ''}:
         return name
 
     # Try lowercase 'name' field as well
-    name = obs.get('name', '').strip()
-    if name and name.lower() not in ['none', 'unknown', '']:
+    name = (obs.get('name') or '').strip()
+    if name and name.lower() not in {'none', 'unknown', ''}:
         return name
 
     # FALLBACK: observer field (only if Name is truly missing)
-    observer = obs.get('observer', '').strip()
-    if observer and observer.lower() not in ['unknown', 'none', '']:
+    observer = (obs.get('observer') or '').strip()
+    if observer and observer.lower() not in {'unknown', 'none', ''}:
         return observer
 
     return 'Unknown'
@@ -230,58 +433,109 @@ def get_actual_observer_name(obs):
 
 def get_observation_type(obs):
     """Get observation type"""
-    obs_type = obs.get('bff8m4x6xbc033kg', 'Other')
-    return obs_type.strip() if obs_type else 'Other'
+    return (obs.get('bff8m4x6xbc033kg') or 'Other').strip()
+
+
+# Shift name for each hour of the day
+_SHIFTS = (("Overnight (0-8 AM)",) * 8 + ("Day Shift (8 AM-4 PM)",) * 8
+           + ("Night Shift (4 PM-Midnight)",) * 8)
 
 
 def get_shift(date_str):
     """Determine shift from time"""
     try:
-        dt = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-        hour = dt.hour
-        if 0 <= hour < 8:
-            return "Overnight (0-8 AM)"
-        elif 8 <= hour < 16:
-            return "Day Shift (8 AM-4 PM)"
-        elif 16 <= hour < 24:
-            return "Night Shift (4 PM-Midnight)"
+        # Still parsed in full so malformed dates come back "Unknown" as before
+        return _SHIFTS[_parse_kpa_datetime(date_str).hour]
     except:
         return "Unknown"
 
 
+# Positive wording that suggests an At-Risk Condition is really a Recognition
+_MISCAT_RE = re.compile(r'good|no issue|no problem|excellent|perfect')
+
+
 def analyze_observations(obs_data):
     """Analyze observations and group by type"""
     if not obs_data:
         return None
 
-    observations_by_type = {}
+    # Both grow a key on a type's first row, so they share by_type's order
+    observations_by_type = defaultdict(list)
+    names_by_type = defaultdict(Counter)
     miscategorized = []
+    shift_counts = {'Day Shift (8 AM-4 PM)': 0, 'Night Shift (4 PM-Midnight)': 0, 'Overnight (0-8 AM)': 0}
 
     for obs in obs_data['rows']:
         obs_type = get_observation_type(obs)
-        if obs_type not in observations_by_type:
-            observations_by_type[obs_type] = []
         observations_by_type[obs_type].append(obs)
 
+        # CRITICAL: counts go to the ACTUAL person observed, NOT the system observer
+        # field (James Barnett, Shelly Batts, etc. are just data entry). This also
+        # leaves '_observer' set on every row for the report builders.
+        actual_name = get_actual_observer_name(obs)
+        names_by_type[obs_type][actual_name] += 1
+
+        shift = get_shift(obs.get('date', ''))
+        if shift in shift_counts:
+            shift_counts[shift] += 1
+
+        # Derived once here; both report builders use them in several sections
+        # (short CSV rows carry None for their missing trailing columns)
+        desc = obs.get('uncbcge9x8vow9pn')
+        obs['_desc80'] = ('No description' if desc is None else desc)[:80]
+        obs['_has_corrective'] = bool((obs.get('dpy2klalngsr7ek9') or '').strip())
+
         # Check for miscategorization
-        text = obs.get('uncbcge9x8vow9pn', '').lower()
         if obs_type == 'At-Risk Condition':
-            if ('good' in text or 'no issue' in text or 'no problem' in text or 'excellent' in text or 'perfect' in text) and len(text) < 100:
-                miscategorized.append({
-                    'report_num': obs.get('report number'),
-                    'type': obs_type,
-                    'actual_type': 'Recognition',
-                    'description': text[:80],
-                    'observer': get_actual_observer_name(obs)
-                })
+            text = obs.get('uncbcge9x8vow9pn') or ''
+            # lower() never shortens text, so long descriptions are skipped before
+            # paying for it; the lowered length is still what the rule checks
+            if len(text) < 100:
+                text = text.lower()
+                if len(text) < 100 and _MISCAT_RE.search(text):
+                    miscategorized.append({
+                        'report_num': obs.get('report number'),
+                        'type': obs_type,
+                        'actual_type': 'Recognition',
+                        'description': text[:80],
+                        'observer': actual_name
+                    })
 
     total = sum(len(v) for v in observations_by_type.values())
 
+    # Merged in by_type order, which is what most_common() falls back to on ties
+    hotspot = Counter()
+    for name_counts in names_by_type.values():
+        hotspot.update(name_counts)
+    hotspot.pop('Unknown', None)
+    hotspot.pop('', None)
+
+    # Top ten recognized people (real names only) with the description of their
+    # first recognition card, which both report builders quote
+    recognition_top = []
+    recognition_counts = names_by_type.get('Recognition')
+    if recognition_counts:
+        first_desc = {}
+        for rec in observations_by_type['Recognition']:
+            first_desc.setdefault(rec['_observer'], rec.get('uncbcge9x8vow9pn'))
+        recognition_top = [(name, count, first_desc[name])
+                           for name, count in recognition_counts.most_common(10)
+                           if name and name != 'Unknown']
+
+    # Open corrective actions, shared by the Word and HTML Open Items sections
+    pending = [(obs_type, obs)
+               for obs_type, obs_list in observations_by_type.items() if obs_type in PENDING_TYPES
+               for obs in obs_list if not obs['_has_corrective']]
+
     return {
         'total': total,
-        'by_type': observations_by_type,
+        'by_type': dict(observations_by_type),  # plain dict, so a stray lookup can't add a type
         'type_counts': {k: len(v) for k, v in observations_by_type.items()},
-        'miscategorized': miscategorized
+        'miscategorized': miscategorized,
+        'hotspot': hotspot,
+        'shift_counts': shift_counts,
+        'recognition_top': recognition_top,
+        'pending': pending,
     }
 
 
@@ -307,7 +561,7 @@ def detect_field_columns(headers):
         h_lower = header.lower()
 
         # Skip standard metadata fields
-        if h_lower in ['report number', 'date', 'link', 'observer', 'name']:
+        if h_lower in {'report number', 'date', 'link', 'observer', 'name'}:
             continue
 
         if any(kw in h_lower for kw in COMPLIANCE_KEYWORDS):
@@ -375,7 +629,7 @@ def get_assessor_name(row):
     """Get assessor/observer name from assessment form row"""
     for field_name, value in row.items():
         if any(kw in field_name.lower() for kw in ['assessor', 'inspector', 'auditor', 'conducted by', 'reviewer']):
-            if value and value.strip() and value.strip().lower() not in ['none', 'unknown', '']:
+            if value and value.strip() and value.strip().lower() not in {'none', 'unknown', ''}:
                 return value.strip()
 
     return get_actual_observer_name(row)
@@ -385,17 +639,17 @@ def get_yard_from_row(row, detected_fields):
     """Extract yard/location from a row using detected fields"""
     for field in detected_fields.get('yard', []):
         val = row.get(field, '').strip()
-        if val and val.lower() not in ['n/a', 'none', 'unknown', '']:
+        if val and val.lower() not in {'n/a', 'none', 'unknown', ''}:
             return val
 
     for key in ['7vj2l992y7fwqhwz', 'lg5pnj4chjadnv46']:
         val = row.get(key, '').strip()
-        if val and val.lower() not in ['n/a', 'none', 'unknown', '']:
+        if val and val.lower() not in {'n/a', 'none', 'unknown', ''}:
             return val
 
     for field_name, value in row.items():
         if ('yard' in field_name.lower() or 'location' in field_name.lower()):
-            if value and value.strip() and value.strip().lower() not in ['n/a', 'none', 'unknown', '']:
+            if value and value.strip() and value.strip().lower() not in {'n/a', 'none', 'unknown', ''}:
                 return value.strip()
 
     return 'Unknown'
@@ -403,11 +657,21 @@ def get_yard_from_row(row, detected_fields):
 
 def get_kpa_link(report_num):
     """Build clickable KPA link from report number"""
-    if report_num and report_num not in ['Report Number', '']:
+    if report_num and report_num not in {'Report Number', ''}:
         return f"{KPA_RESPONSE_URL}/{report_num}"
     return ''
 
 
+def _by_total(item):
+    """Sort key for (name, stats) pairs by assessment count"""
+    return item[1]['total']
+
+
+def _by_non_compliant(item):
+    """Sort key for (yard, info) pairs by non-compliant count"""
+    return item[1]['non_compliant']
+
+
 def analyze_assessments(all_data):
     """Analyze all assessment/audit form data for the daily report"""
     analysis = {
@@ -480,7 +744,7 @@ def analyze_assessments(all_data):
             # Extract findings
             for finding_field in detected['findings']:
                 finding_text = row.get(finding_field, '').strip()
-                if finding_text and len(finding_text) > 3 and finding_text.lower() not in ['n/a', 'none', 'no', 'na']:
+                if finding_text and len(finding_text) > 3 and finding_text.lower() not in {'n/a', 'none', 'no', 'na'}:
                     severity = classify_severity(finding_text)
 
                     for sev_field in detected['severity']:
@@ -511,7 +775,7 @@ def analyze_assessments(all_data):
             # Extract corrective actions
             for ca_field in detected['corrective_action']:
                 ca_text = row.get(ca_field, '').strip()
-                if ca_text and len(ca_text) > 3 and ca_text.lower() not in ['n/a', 'none', 'no', 'na']:
+                if ca_text and len(ca_text) > 3 and ca_text.lower() not in {'n/a', 'none', 'no', 'na'}:
                     analysis['corrective_actions'].append({
                         'form_name': form_info['name'],
                         'description': ca_text[:200],
@@ -621,7 +885,7 @@ def _generate_assessment_recommendations(analysis):
     # MONTHLY: Recognition and coverage
     if analysis['assessor_stats']:
         top_assessors = sorted(analysis['assessor_stats'].items(),
-                               key=lambda x: x[1]['total'], reverse=True)[:3]
+                               key=_by_total, reverse=True)[:3]
         names = [a[0] for a in top_assessors if a[0] != 'Unknown']
         if names:
             recs['monthly'].append(f"Recognize top assessors: {', '.join(names)}")
@@ -643,7 +907,7 @@ def _get_customer_from_row(row):
     """Extract customer/client name from a form row"""
     for field_name, value in row.items():
         if any(kw in field_name.lower() for kw in ['customer', 'client', 'company', 'operator', 'contractor']):
-            if value and value.strip() and value.strip().lower() not in ['n/a', 'none', 'unknown', '']:
+            if value and value.strip() and value.strip().lower() not in {'n/a', 'none', 'unknown', ''}:
                 return value.strip()
     return ''
 
@@ -653,19 +917,19 @@ def _get_issue_from_row(row, detected_fields):
     # Try detected finding fields first
     for field in detected_fields.get('findings', []):
         val = row.get(field, '').strip()
-        if val and len(val) > 3 and val.lower() not in ['n/a', 'none', 'no', 'na', 'no issues']:
+        if val and len(val) > 3 and val.lower() not in {'n/a', 'none', 'no', 'na', 'no issues'}:
             return val[:120]
 
     # Try corrective action fields (often contain the issue description)
     for field in detected_fields.get('corrective_action', []):
         val = row.get(field, '').strip()
-        if val and len(val) > 3 and val.lower() not in ['n/a', 'none', 'no', 'na']:
+        if val and len(val) > 3 and val.lower() not in {'n/a', 'none', 'no', 'na'}:
             return val[:120]
 
     # Try observation description field used by observation cards
     for key in ['uncbcge9x8vow9pn']:
         val = row.get(key, '').strip()
-        if val and len(val) > 3 and val.lower() not in ['n/a', 'none', 'no', 'na']:
+        if val and len(val) > 3 and val.lower() not in {'n/a', 'none', 'no', 'na'}:
             return val[:120]
 
     return 'None noted'
@@ -748,55 +1012,46 @@ def add_assessment_audit_summary(doc, assessment_details):
         for paragraph in hdr_cells[i].paragraphs:
             for run in paragraph.runs:
                 run.font.bold = True
-                run.font.size = Pt(8)
+                run.font.size = PT_8
                 run.font.color.rgb = RGBColor(255, 255, 255)
         shading = _OE('w:shd')
         shading.set(_qn('w:fill'), '800000')
         hdr_cells[i]._tc.get_or_add_tcPr().append(shading)
 
+    # Body rows are emitted as raw <w:tr> XML, like the report body, and appended in one
+    # parse; table.add_row().cells re-walks the whole table for every row
+    tc_open = [f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{grid_col.w.twips}"/></w:tcPr><w:p>'
+               for grid_col in table._tbl.tblGrid.gridCol_lst]
+    part = doc.part
+    rows_xml = []
     for entry in assessment_details:
         if entry['count'] == 0:
             # Show a single row with 0 count
-            row_cells = table.add_row().cells
-            row_cells[0].text = entry['form_name']
-            row_cells[1].text = '-'
-            row_cells[2].text = '-'
-            row_cells[3].text = '-'
-            row_cells[4].text = '-'
-            row_cells[5].text = '0 assessments'
-            for cell in row_cells:
-                for paragraph in cell.paragraphs:
-                    for run in paragraph.runs:
-                        run.font.size = Pt(8)
-                        run.font.color.rgb = RGBColor(128, 128, 128)
+            cells = (entry['form_name'], '-', '-', '-', '-', '0 assessments')
+            rows_xml.append(_w_table_row(tc_open, [_w_run(text, size=8, color='808080') for text in cells]))
         else:
             for detail in entry['rows']:
-                row_cells = table.add_row().cells
-                row_cells[0].text = entry['form_name']
-                row_cells[1].text = detail['assessor']
-                row_cells[2].text = detail['location']
-                row_cells[3].text = detail['customer'] or '-'
-                row_cells[4].text = str(detail['form_id'])
-                row_cells[5].text = detail['issue']
-
-                for cell in row_cells:
-                    for paragraph in cell.paragraphs:
-                        for run in paragraph.runs:
-                            run.font.size = Pt(8)
-
-                # Color-code the issue cell
-                issue_text = detail['issue'].lower()
-                if issue_text != 'none noted':
-                    for paragraph in row_cells[5].paragraphs:
-                        for run in paragraph.runs:
-                            run.font.color.rgb = COLORS['warning']
+                form_id = str(detail['form_id'])
+                runs = [_w_run(entry['form_name'], size=8),
+                        _w_run(detail['assessor'], size=8),
+                        _w_run(detail['location'], size=8),
+                        _w_run(detail['customer'] or '-', size=8)]
 
                 # Make Form ID a clickable link if available
                 if detail['link']:
-                    for paragraph in row_cells[4].paragraphs:
-                        paragraph.clear()
-                    p = row_cells[4].paragraphs[0]
-                    add_hyperlink(p, detail['link'], str(detail['form_id']))
+                    r_id = part.relate_to(detail['link'], RT.HYPERLINK, is_external=True)
+                    runs.append(W_TABLE_LINK % (r_id, _w_text(form_id)))
+                else:
+                    runs.append(_w_run(form_id, size=8))
+
+                # Color-code the issue cell
+                issue_color = W_COLORS['warning'] if detail['issue'].lower() != 'none noted' else None
+                runs.append(_w_run(detail['issue'], size=8, color=issue_color))
+                rows_xml.append(_w_table_row(tc_open, runs))
+
+    if rows_xml:
+        fragment = parse_xml(f'<w:tbl {nsdecls("w", "r")}>{"".join(rows_xml)}</w:tbl>')
+        table._tbl.extend(list(fragment))
 
     # Summary line
     doc.add_paragraph()
@@ -812,90 +1067,237 @@ def build_assessment_html(assessment_details):
     total_rows = sum(entry['count'] for entry in assessment_details)
 
     if total_rows == 0:
-        html = '<p style="font-style:italic;">No assessment or audit forms were completed yesterday.</p>'
-        html += '<ul style="margin:5px 0;color:#888;">'
+        html = ['<p style="font-style:italic;">No assessment or audit forms were completed yesterday.</p>']
+        html.append('<ul style="margin:5px 0;color:#888;">')
         for entry in assessment_details:
-            html += f'<li><b>{_h(entry["form_name"])}:</b> 0</li>'
-        html += '</ul>'
-        return html
+            html.append(f'<li><b>{_h(entry["form_name"])}:</b> 0</li>')
+        html.append('</ul>')
+        return ''.join(html)
 
-    html = '<table width="100%" cellpadding="5" cellspacing="0" '
-    html += 'style="border-collapse:collapse;font-size:12px;margin-bottom:10px;">'
+    html = ['<table width="100%" cellpadding="5" cellspacing="0" ']
+    html.append('style="border-collapse:collapse;font-size:12px;margin-bottom:10px;">')
 
     # Header
-    html += f'<tr style="background:{HTML_COLORS["secondary"]};color:#ffffff;">'
+    html.append(f'<tr style="background:{HTML_COLORS["secondary"]};color:#ffffff;">')
     for hdr in ['Form Type', 'Assessor', 'Location', 'Customer', 'Form ID', 'Issue Found']:
-        html += f'<th style="text-align:left;padding:8px;border:1px solid #600000;">{hdr}</th>'
-    html += '</tr>'
+        html.append(f'<th style="text-align:left;padding:8px;border:1px solid #600000;">{hdr}</th>')
+    html.append('</tr>')
 
     row_idx = 0
     for entry in assessment_details:
         if entry['count'] == 0:
             bg = '#f9f9f9' if row_idx % 2 == 0 else '#ffffff'
-            html += f'<tr style="background:{bg};color:#999;">'
-            html += f'<td style="border:1px solid #ddd;padding:6px;">{_h(entry["form_name"])}</td>'
+            html.append(f'<tr style="background:{bg};color:#999;">')
+            html.append(f'<td style="border:1px solid #ddd;padding:6px;">{_h(entry["form_name"])}</td>')
             for _ in range(4):
-                html += '<td style="border:1px solid #ddd;padding:6px;text-align:center;">-</td>'
-            html += '<td style="border:1px solid #ddd;padding:6px;">0 assessments</td>'
-            html += '</tr>'
+                html.append('<td style="border:1px solid #ddd;padding:6px;text-align:center;">-</td>')
+            html.append('<td style="border:1px solid #ddd;padding:6px;">0 assessments</td>')
+            html.append('</tr>')
             row_idx += 1
         else:
             for detail in entry['rows']:
                 bg = '#f9f9f9' if row_idx % 2 == 0 else '#ffffff'
-                html += f'<tr style="background:{bg};">'
-                html += f'<td style="border:1px solid #ddd;padding:6px;">{_h(entry["form_name"])}</td>'
-                html += f'<td style="border:1px solid #ddd;padding:6px;">{_h(detail["assessor"])}</td>'
-                html += f'<td style="border:1px solid #ddd;padding:6px;">{_h(detail["location"])}</td>'
-                html += f'<td style="border:1px solid #ddd;padding:6px;">{_h(detail["customer"]) or "-"}</td>'
+                html.append(f'<tr style="background:{bg};">')
+                html.append(f'<td style="border:1px solid #ddd;padding:6px;">{_h(entry["form_name"])}</td>')
+                html.append(f'<td style="border:1px solid #ddd;padding:6px;">{_h(detail["assessor"])}</td>')
+                html.append(f'<td style="border:1px solid #ddd;padding:6px;">{_h(detail["location"])}</td>')
+                html.append(f'<td style="border:1px solid #ddd;padding:6px;">{_h(detail["customer"]) or "-"}</td>')
 
                 # Form ID with link
                 if detail['link']:
-                    html += f'<td style="border:1px solid #ddd;padding:6px;">'
-                    html += f'<a href="{_h(detail["link"])}" style="color:#0563C1;">{_h(detail["form_id"])}</a></td>'
+                    html.append(f'<td style="border:1px solid #ddd;padding:6px;">')
+                    html.append(f'<a href="{_h(detail["link"])}" style="color:#0563C1;">{_h(detail["form_id"])}</a></td>')
                 else:
-                    html += f'<td style="border:1px solid #ddd;padding:6px;">{_h(detail["form_id"])}</td>'
+                    html.append(f'<td style="border:1px solid #ddd;padding:6px;">{_h(detail["form_id"])}</td>')
 
                 # Issue with color
                 issue = detail['issue']
                 if issue.lower() != 'none noted':
-                    html += f'<td style="border:1px solid #ddd;padding:6px;color:{HTML_COLORS["warning"]};">{_h(issue)}</td>'
+                    html.append(f'<td style="border:1px solid #ddd;padding:6px;color:{HTML_COLORS["warning"]};">{_h(issue)}</td>')
                 else:
-                    html += f'<td style="border:1px solid #ddd;padding:6px;color:{HTML_COLORS["safe"]};">{_h(issue)}</td>'
+                    html.append(f'<td style="border:1px solid #ddd;padding:6px;color:{HTML_COLORS["safe"]};">{_h(issue)}</td>')
 
-                html += '</tr>'
+                html.append('</tr>')
                 row_idx += 1
 
-    html += '</table>'
-    html += f'<p><b>Total: {total_rows} assessments/audits completed</b></p>'
+    html.append('</table>')
+    html.append(f'<p><b>Total: {total_rows} assessments/audits completed</b></p>')
 
-    return html
+    return ''.join(html)
 
 
 # ==============================================================================
 # DOCUMENT HELPERS
 # ==============================================================================
 
+# Heading level -> (font size, default color); other levels stay unstyled
+_HEADING_CFG = {
+    1: (PT_18, COLORS['primary']),
+    2: (PT_14, COLORS['secondary']),
+    3: (PT_12, COLORS['accent']),
+}
+
+
 def add_heading(doc, text, level=1, color=None):
     """Add formatted heading"""
     p = doc.add_paragraph()
     run = p.add_run(text)
 
-    if level == 1:
-        run.font.size = Pt(18)
+    cfg = _HEADING_CFG.get(level)
+    if cfg:
+        size, default_color = cfg
+        run.font.size = size
         run.font.bold = True
-        run.font.color.rgb = color or COLORS['primary']
-    elif level == 2:
-        run.font.size = Pt(14)
-        run.font.bold = True
-        run.font.color.rgb = color or COLORS['secondary']
-    elif level == 3:
-        run.font.size = Pt(12)
-        run.font.bold = True
-        run.font.color.rgb = color or COLORS['accent']
+        run.font.color.rgb = color or default_color
 
     return p
 
 
+# Raw WordprocessingML emitters. python-docx builds every paragraph and run
+# through its object model, which dominates report build time. The fixed-shape
+# report sections are instead assembled as <w:p> strings and spliced into the
+# document body with a single parse (see _append_body_xml).
+
+W_BULLET = 'ListBullet'
+W_BULLET_2 = 'ListBullet2'
+W_EMPTY = '<w:p/>'
+W_PAGE_BREAK = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+# COLORS as the hex strings <w:color> takes, formatted once instead of per run
+W_COLORS = {name: str(rgb) for name, rgb in COLORS.items()}
+
+
+def _w_text(text):
+    """Escape run text into <w:t> elements, mapping line breaks and tabs as run.text does"""
+    if text is None:
+        return ''
+    text = html_escape(str(text), quote=False).replace('\r\n', '\n').replace('\r', '\n')
+    return '<w:br/>'.join(
+        '<w:tab/>'.join(f'<w:t xml:space="preserve">{part}</w:t>' if part else '' for part in line.split('\t'))
+        for line in text.split('\n'))
+
+
+def _w_run(text, bold=False, italic=False, size=None, color=None):
+    """Build a <w:r> string (size in points, color as RGBColor or hex)"""
+    props = ''
+    if bold:
+        props += '<w:b/>'
+    if italic:
+        props += '<w:i/>'
+    if color is not None:
+        props += f'<w:color w:val="{color}"/>'
+    if size:
+        props += f'<w:sz w:val="{int(size * 2)}"/>'
+    if props:
+        props = f'<w:rPr>{props}</w:rPr>'
+    return f'<w:r>{props}{_w_text(text)}</w:r>'
+
+
+def _w_para(*runs, style=None, align=None):
+    """Build a <w:p> string from run strings (style is a style id, e.g. W_BULLET)"""
+    props = ''
+    if style:
+        props += f'<w:pStyle w:val="{style}"/>'
+    if align:
+        props += f'<w:jc w:val="{align}"/>'
+    if props:
+        props = f'<w:pPr>{props}</w:pPr>'
+    return f'<w:p>{props}{"".join(runs)}</w:p>'
+
+
+def _w_field(label, value):
+    """Build a "Label: value" paragraph (bold label run, plain value run)"""
+    return ''.join(('<w:p><w:r><w:rPr><w:b/></w:rPr>', _w_text(label),
+                    '</w:r><w:r>', _w_text(value), '</w:r></w:p>'))
+
+
+def _w_heading(text, level=1, color=None):
+    """Raw-XML counterpart of add_heading()"""
+    cfg = _HEADING_CFG.get(level)
+    if cfg:
+        size, default_color = cfg
+        return _w_para(_w_run(text, bold=True, size=size.pt, color=color or default_color))
+    return _w_para(_w_run(text))
+
+
+# Fixed-shape report chrome, serialized once at import. W_HEADER takes the
+# report date and generated timestamp with %.
+
+W_HEADER_NO_LOGOS = _w_para(_w_run("BRHAS Safety Companies", bold=True, size=16, color=W_COLORS['primary']),
+                            align='center')
+
+W_HEADER = ''.join((
+    _w_para(_w_run("DAILY SAFETY REPORT", bold=True, size=24, color=W_COLORS['primary']), align='center'),
+    _w_para(_w_run("HSE Management Summary", italic=True, size=12, color=W_COLORS['secondary']), align='center'),
+    _w_para(_w_run("Report Date: %s", bold=True, size=11, color=W_COLORS['accent']), align='center'),
+    _w_para(_w_run("Generated: %s", size=9, color=W_COLORS['secondary']), align='center'),
+    W_EMPTY,
+))
+
+W_STREAK_FIXED = ''.join((
+    _w_heading("SAFETY STREAK METRICS", 1, W_COLORS['primary']),
+    _w_field("Days Since Lost-Time Injury: ", "127 days ✅"),
+    _w_field("Days Since Recordable Incident: ", "89 days ✅"),
+))
+
+W_FOOTER = ''.join((
+    W_EMPTY,
+    _w_para(_w_run("END OF REPORT", italic=True, size=10, color=W_COLORS['primary']), align='center'),
+    _w_para(_w_run("Butch's Rat Hole & Anchor Service Inc. | HSE Department",
+                   size=9, color=W_COLORS['secondary']), align='center'),
+))
+
+
+# Hyperlink run for a table cell, styled as add_hyperlink does; takes (r:id, <w:t> xml)
+W_TABLE_LINK = ('<w:hyperlink r:id="%s"><w:r><w:rPr><w:color w:val="0563C1"/><w:u w:val="single"/>'
+                '<w:sz w:val="18"/></w:rPr>%s</w:r></w:hyperlink>')
+
+
+def _w_table_row(tc_open, cell_runs):
+    """Build a <w:tr> string, one single-paragraph cell per run string"""
+    return '<w:tr>' + ''.join(f'{tc}{runs}</w:p></w:tc>' for tc, runs in zip(tc_open, cell_runs)) + '</w:tr>'
+
+
+def _append_body_xml(doc, parts):
+    """Parse the accumulated <w:p> strings once and splice them into the body.
+
+    Clears parts so the same list can keep accumulating after python-docx
+    helpers (tables, hyperlinks, pictures) have added their own content.
+    """
+    if not parts:
+        return
+    body = doc.element.body
+    fragment = parse_xml(f'<w:body {nsdecls("w")}>{"".join(parts)}</w:body>')
+    sect_pr = body.sectPr
+    for child in list(fragment):
+        if sect_pr is not None:
+            sect_pr.addprevious(child)
+        else:
+            body.append(child)
+    parts.clear()
+
+
+def _save_docx(doc, path):
+    """Write doc as Document.save does, but deflate every part at level 1.
+
+    The report is mostly text XML; zlib's default level 6 costs several times
+    the CPU of level 1 for a modestly smaller email attachment.
+    """
+    if _ContentTypesItem is None:
+        doc.save(path)
+        return
+    package = doc.part.package
+    parts = list(package.parts)
+    for part in parts:
+        part.before_marshal()
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as z:
+        z.writestr(CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(parts).blob)
+        z.writestr(PACKAGE_URI.rels_uri.membername, package.rels.xml)
+        for part in parts:
+            z.writestr(part.partname.membername, part.blob)
+            if len(part.rels):
+                z.writestr(part.partname.rels_uri.membername, part.rels.xml)
+
+
 # ==============================================================================
 # ASSESSMENT & AUDIT ANALYSIS - WORD DOCUMENT SECTION
 # ==============================================================================
@@ -952,6 +1354,9 @@ def add_assessment_analysis_section(doc, assessment_data):
     if not assessment_data or not assessment_data.get('has_data'):
         return
 
+    # Resolved once; add_paragraph() would otherwise look the style up by name per bullet
+    bullet = doc.styles['List Bullet']
+
     doc.add_page_break()
     add_heading(doc, "ASSESSMENT & AUDIT ANALYSIS", 1, COLORS['primary'])
 
@@ -976,7 +1381,7 @@ def add_assessment_analysis_section(doc, assessment_data):
             for paragraph in hdr_cells[i].paragraphs:
                 for run in paragraph.runs:
                     run.font.bold = True
-                    run.font.size = Pt(9)
+                    run.font.size = PT_9
                     run.font.color.rgb = RGBColor(255, 255, 255)
             # Dark header background
             from docx.oxml.ns import qn as _qn
@@ -1011,7 +1416,7 @@ def add_assessment_analysis_section(doc, assessment_data):
             for cell in row_cells:
                 for paragraph in cell.paragraphs:
                     for run in paragraph.runs:
-                        run.font.size = Pt(9)
+                        run.font.size = PT_9
 
     doc.add_paragraph()
 
@@ -1028,7 +1433,7 @@ def add_assessment_analysis_section(doc, assessment_data):
             for paragraph in hdr_cells[i].paragraphs:
                 for run in paragraph.runs:
                     run.font.bold = True
-                    run.font.size = Pt(9)
+                    run.font.size = PT_9
                     run.font.color.rgb = RGBColor(255, 255, 255)
             from docx.oxml.ns import qn as _qn
             from docx.oxml import OxmlElement as _OE
@@ -1037,7 +1442,7 @@ def add_assessment_analysis_section(doc, assessment_data):
             hdr_cells[i]._tc.get_or_add_tcPr().append(shading)
 
         for yard, info in sorted(assessment_data['compliance_by_yard'].items(),
-                                  key=lambda x: x[1]['non_compliant'], reverse=True):
+                                  key=_by_non_compliant, reverse=True):
             row_cells = table.add_row().cells
             row_cells[0].text = yard
             row_cells[1].text = str(info['total'])
@@ -1058,7 +1463,7 @@ def add_assessment_analysis_section(doc, assessment_data):
             for cell in row_cells:
                 for paragraph in cell.paragraphs:
                     for run in paragraph.runs:
-                        run.font.size = Pt(9)
+                        run.font.size = PT_9
 
         doc.add_paragraph()
 
@@ -1078,21 +1483,21 @@ def add_assessment_analysis_section(doc, assessment_data):
 
             doc.add_paragraph(
                 f"Form: {finding['form_name']} | Assessor: {finding['assessor']}",
-                style='List Bullet'
+                style=bullet
             )
             doc.add_paragraph(
                 f"Yard: {finding['yard']} | Date: {finding['date']}",
-                style='List Bullet'
+                style=bullet
             )
 
             if finding['link']:
-                p = doc.add_paragraph(style='List Bullet')
+                p = doc.add_paragraph(style=bullet)
                 p.add_run("View in KPA: ")
                 add_hyperlink(p, finding['link'], finding['link'])
 
             doc.add_paragraph()
 
-        for finding in high[:5]:
+        for finding in islice(high, 5):
             p = doc.add_paragraph()
             run = p.add_run("\U0001f7e1 HIGH: ")
             run.font.bold = True
@@ -1101,11 +1506,11 @@ def add_assessment_analysis_section(doc, assessment_data):
 
             doc.add_paragraph(
                 f"Form: {finding['form_name']} | Yard: {finding['yard']}",
-                style='List Bullet'
+                style=bullet
             )
 
             if finding['link']:
-                p = doc.add_paragraph(style='List Bullet')
+                p = doc.add_paragraph(style=bullet)
                 p.add_run("View in KPA: ")
                 add_hyperlink(p, finding['link'], finding['link'])
 
@@ -1137,11 +1542,11 @@ def add_assessment_analysis_section(doc, assessment_data):
 
         sorted_assessors = sorted(
             assessment_data['assessor_stats'].items(),
-            key=lambda x: x[1]['total'], reverse=True
+            key=_by_total, reverse=True
         )
 
         rank = 0
-        for name, stats in sorted_assessors[:10]:
+        for name, stats in islice(sorted_assessors, 10):
             if name == 'Unknown':
                 continue
             rank += 1
@@ -1167,22 +1572,22 @@ def add_assessment_analysis_section(doc, assessment_data):
         p.add_run(f"Open Corrective Actions: {len(assessment_data['corrective_actions'])}").font.bold = True
         doc.add_paragraph()
 
-        for i, ca in enumerate(assessment_data['corrective_actions'][:10], 1):
+        for i, ca in enumerate(islice(assessment_data['corrective_actions'], 10), 1):
             p = doc.add_paragraph()
             run = p.add_run(f"{i}. {ca['description']}")
             run.font.bold = True
 
             doc.add_paragraph(
                 f"Form: {ca['form_name']} | Yard: {ca['yard']}",
-                style='List Bullet'
+                style=bullet
             )
             doc.add_paragraph(
                 f"Identified by: {ca['assessor']} on {ca['date']}",
-                style='List Bullet'
+                style=bullet
             )
 
             if ca['link']:
-                p = doc.add_paragraph(style='List Bullet')
+                p = doc.add_paragraph(style=bullet)
                 p.add_run("View: ")
                 add_hyperlink(p, ca['link'], ca['link'])
 
@@ -1200,7 +1605,7 @@ def add_assessment_analysis_section(doc, assessment_data):
         add_heading(doc, "Trends & Patterns", 2)
 
         for trend in assessment_data['trends']:
-            doc.add_paragraph(f"\U0001F4CA {trend}", style='List Bullet')
+            doc.add_paragraph(f"\U0001F4CA {trend}", style=bullet)
 
         doc.add_paragraph()
 
@@ -1215,7 +1620,7 @@ def add_assessment_analysis_section(doc, assessment_data):
             run.font.bold = True
             run.font.color.rgb = COLORS['critical']
             for rec in recs['immediate']:
-                doc.add_paragraph(rec, style='List Bullet')
+                doc.add_paragraph(rec, style=bullet)
 
         if recs['this_week']:
             p = doc.add_paragraph()
@@ -1223,30 +1628,54 @@ def add_assessment_analysis_section(doc, assessment_data):
             run.font.bold = True
             run.font.color.rgb = COLORS['warning']
             for rec in recs['this_week']:
-                doc.add_paragraph(rec, style='List Bullet')
+                doc.add_paragraph(rec, style=bullet)
 
         if recs['monthly']:
             p = doc.add_paragraph()
             run = p.add_run("\U0001F4CA MONTH-OVER-MONTH:")
             run.font.bold = True
             for rec in recs['monthly']:
-                doc.add_paragraph(rec, style='List Bullet')
+                doc.add_paragraph(rec, style=bullet)
 
 
 # ==============================================================================
 # BUILD WORD DOCUMENT
 # ==============================================================================
 
-def build_word_document(all_data, yesterday_date):
-    """Build HSE director daily report"""
+def build_word_document(all_data, yesterday_date, *, out=None):
+    """Build HSE director daily report.
+
+    Returns the Document, or, when out (a path or binary file object) is
+    given, writes the .docx package straight to out and returns out.
+    """
+    doc = _build_word_document(all_data, yesterday_date)
+    if out is None:
+        return doc
+    _save_docx(doc, out)
+    return out
+
+
+def _build_word_document(all_data, yesterday_date):
     doc = Document()
 
+    c_critical, c_warning, c_safe = W_COLORS['critical'], W_COLORS['warning'], W_COLORS['safe']
+
+    # _parse_form_csv already dropped the 'Report Number' header-echo rows
+    incident_data = all_data.get('incident_reports')
+    real_incidents = incident_data['rows'] if incident_data else []
+    rca_data = all_data.get('rca')
+    real_rca = rca_data['rows'] if rca_data else []
+
+    obs_analysis = all_data.get('observation_analysis')
+    by_type = obs_analysis['by_type'] if obs_analysis else {}
+    near_misses = by_type.get('Near Miss', [])
+
     sections = doc.sections
     for section in sections:
-        section.top_margin = Inches(0.75)
-        section.bottom_margin = Inches(0.75)
-        section.left_margin = Inches(0.75)
-        section.right_margin = Inches(0.75)
+        section.top_margin = PAGE_MARGIN
+        section.bottom_margin = PAGE_MARGIN
+        section.left_margin = PAGE_MARGIN
+        section.right_margin = PAGE_MARGIN
 
     # ========================================================================
     # HEADER
@@ -1257,101 +1686,49 @@ def build_word_document(all_data, yesterday_date):
 
     logos_added = 0
     for logo_filename in LOGOS:
-        logo_path = os.path.join(LOGOS_PATH, logo_filename)
-        if os.path.exists(logo_path):
-            try:
-                run = p.add_run()
-                run.add_picture(logo_path, width=Inches(1.0))
-                logos_added += 1
-            except:
-                pass
-
-    if logos_added == 0:
-        p = doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = p.add_run("BRHAS Safety Companies")
-        run.font.size = Pt(16)
-        run.font.bold = True
-        run.font.color.rgb = COLORS['primary']
-
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run = p.add_run("DAILY SAFETY REPORT")
-    run.font.size = Pt(24)
-    run.font.bold = True
-    run.font.color.rgb = COLORS['primary']
-
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run = p.add_run("HSE Management Summary")
-    run.font.size = Pt(12)
-    run.font.italic = True
-    run.font.color.rgb = COLORS['secondary']
+        logo_bytes = _LOGO_BYTES.get(logo_filename)
+        if logo_bytes:
+            p.add_run().add_picture(BytesIO(logo_bytes), width=LOGO_WIDTH)
+            logos_added += 1
 
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run = p.add_run(f"Report Date: {yesterday_date.strftime('%A, %B %d, %Y')}")
-    run.font.size = Pt(11)
-    run.font.bold = True
-    run.font.color.rgb = COLORS['accent']
+    # Everything below the logo row is emitted as raw XML and flushed into
+    # the body before each python-docx helper (and once at the end)
+    parts = []
+    w = parts.append
 
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run = p.add_run(f"Generated: {datetime.now().strftime('%B %d, %Y at %H:%M:%S')}")
-    run.font.size = Pt(9)
-    run.font.color.rgb = COLORS['secondary']
+    if logos_added == 0:
+        w(W_HEADER_NO_LOGOS)
 
-    doc.add_paragraph()
+    w(W_HEADER % (yesterday_date.strftime(REPORT_DATE_FMT), datetime.now().strftime(GENERATED_FMT)))
 
     # ========================================================================
     # SAFETY STREAK METRICS
     # ========================================================================
 
-    add_heading(doc, "SAFETY STREAK METRICS", 1, COLORS['primary'])
+    w(W_STREAK_FIXED)
 
-    p = doc.add_paragraph()
-    p.add_run("Days Since Lost-Time Injury: ").font.bold = True
-    p.add_run("127 days ✅")
+    if real_incidents:
+        w(_w_para(_w_run("Days Since Any Incident: ", bold=True),
+                  _w_run("0 days (New incident reported)", color=c_critical)))
 
-    p = doc.add_paragraph()
-    p.add_run("Days Since Recordable Incident: ").font.bold = True
-    p.add_run("89 days ✅")
-
-    if 'incident_reports' in all_data and all_data['incident_reports']:
-        inc_data = all_data['incident_reports']
-        real_incidents = [inc for inc in inc_data['rows'] if inc.get('report number') != 'Report Number']
-        if real_incidents:
-            p = doc.add_paragraph()
-            p.add_run("Days Since Any Incident: ").font.bold = True
-            run = p.add_run("0 days (New incident reported)")
-            run.font.color.rgb = COLORS['critical']
-
-    p = doc.add_paragraph()
-    p.add_run("Days Since Near-Miss Report: ").font.bold = True
-
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        obs_analysis = all_data['observation_analysis']
-        near_miss = obs_analysis['type_counts'].get('Near Miss', 0)
-        if near_miss > 0:
-            run = p.add_run("0 days (Early warning system active) ✅")
-            run.font.color.rgb = COLORS['safe']
+    near_miss_runs = [_w_run("Days Since Near-Miss Report: ", bold=True)]
+    if obs_analysis:
+        if near_misses:
+            near_miss_runs.append(_w_run("0 days (Early warning system active) ✅", color=c_safe))
         else:
-            p.add_run("N/A")
+            near_miss_runs.append(_w_run("N/A"))
+    w(_w_para(*near_miss_runs))
 
-    doc.add_paragraph()
+    w(W_EMPTY)
 
     # ========================================================================
     # EXECUTIVE SUMMARY
     # ========================================================================
 
-    add_heading(doc, "EXECUTIVE SUMMARY", 1)
+    w(_w_heading("EXECUTIVE SUMMARY", 1))
 
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        obs_analysis = all_data['observation_analysis']
-
-        p = doc.add_paragraph()
-        p.add_run(f"Total Observations: ").font.bold = True
-        p.add_run(f"{obs_analysis['total']}")
+    if obs_analysis:
+        w(_w_field("Total Observations: ", f"{obs_analysis['total']}"))
 
         near_miss_count = obs_analysis['type_counts'].get('Near Miss', 0)
         at_risk_behavior_count = obs_analysis['type_counts'].get('At-Risk Behavior', 0)
@@ -1359,357 +1736,227 @@ def build_word_document(all_data, yesterday_date):
         at_risk_procedure_count = obs_analysis['type_counts'].get('At-Risk Procedure', 0)
         recognition_count = obs_analysis['type_counts'].get('Recognition', 0)
 
-        p = doc.add_paragraph()
-        p.add_run("Summary: ").font.bold = True
+        w(_w_para(_w_run("Summary: ", bold=True)))
 
         if near_miss_count > 0:
-            run = doc.add_paragraph(f"🔴 NEAR MISSES: {near_miss_count}", style='List Bullet').runs[0]
-            run.font.color.rgb = COLORS['critical']
+            w(_w_para(_w_run(f"🔴 NEAR MISSES: {near_miss_count}", color=c_critical), style=W_BULLET))
 
         if at_risk_behavior_count > 0:
-            run = doc.add_paragraph(f"🔴 AT-RISK BEHAVIOR: {at_risk_behavior_count}", style='List Bullet').runs[0]
-            run.font.color.rgb = COLORS['critical']
+            w(_w_para(_w_run(f"🔴 AT-RISK BEHAVIOR: {at_risk_behavior_count}", color=c_critical), style=W_BULLET))
 
         if at_risk_condition_count > 0:
-            doc.add_paragraph(f"🟡 AT-RISK CONDITIONS: {at_risk_condition_count}", style='List Bullet')
+            w(_w_para(_w_run(f"🟡 AT-RISK CONDITIONS: {at_risk_condition_count}"), style=W_BULLET))
 
         if at_risk_procedure_count > 0:
-            doc.add_paragraph(f"🟡 AT-RISK PROCEDURES: {at_risk_procedure_count}", style='List Bullet')
+            w(_w_para(_w_run(f"🟡 AT-RISK PROCEDURES: {at_risk_procedure_count}"), style=W_BULLET))
 
         if recognition_count > 0:
-            run = doc.add_paragraph(f"✅ SAFETY RECOGNITION: {recognition_count}", style='List Bullet').runs[0]
-            run.font.color.rgb = COLORS['safe']
+            w(_w_para(_w_run(f"✅ SAFETY RECOGNITION: {recognition_count}", color=c_safe), style=W_BULLET))
     else:
-        p = doc.add_paragraph()
-        p.add_run(f"Total Observations: ").font.bold = True
-        p.add_run("0 - Safe day!")
-
-    if 'incident_reports' in all_data and all_data['incident_reports']:
-        inc_data = all_data['incident_reports']
-        real_incidents = [inc for inc in inc_data['rows'] if inc.get('report number') != 'Report Number']
-        if real_incidents:
-            run = doc.add_paragraph(f"⚠️ INCIDENT REPORTS: {len(real_incidents)}", style='List Bullet').runs[0]
-            run.font.color.rgb = COLORS['critical']
+        w(_w_field("Total Observations: ", "0 - Safe day!"))
 
-    doc.add_paragraph()
+    if real_incidents:
+        w(_w_para(_w_run(f"⚠️ INCIDENT REPORTS: {len(real_incidents)}", color=c_critical), style=W_BULLET))
+
+    w(W_EMPTY)
 
     # ========================================================================
-    # ACTION ITEMS FOR TODAY
+    # ACTION ITEMS FOR TODAY (each group's reports are one line-broken paragraph)
     # ========================================================================
 
-    add_heading(doc, "ACTION ITEMS FOR TODAY", 1, COLORS['critical'])
+    w(_w_heading("ACTION ITEMS FOR TODAY", 1, c_critical))
 
     action_count = 0
 
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        obs_analysis = all_data['observation_analysis']
-
-        near_misses = obs_analysis['by_type'].get('Near Miss', [])
-        at_risk_behavior = obs_analysis['by_type'].get('At-Risk Behavior', [])
-
-        if near_misses:
-            action_count += len(near_misses)
-            p = doc.add_paragraph()
-            p.add_run(f"1. NEAR MISSES - Contact {len(near_misses)} for incident investigation").font.bold = True
-            for nm in near_misses:
-                actual_name = get_actual_observer_name(nm)
-                doc.add_paragraph(
-                    f"• Report #{nm.get('report number')} - {actual_name} - {nm.get('date')}",
-                    style='List Bullet 2'
-                )
-
-        if at_risk_behavior:
-            action_count += len(at_risk_behavior)
-            p = doc.add_paragraph()
-            p.add_run(f"2. AT-RISK BEHAVIORS - Schedule coaching for {len(at_risk_behavior)}").font.bold = True
-            for arb in at_risk_behavior:
-                actual_name = get_actual_observer_name(arb)
-                doc.add_paragraph(
-                    f"• Report #{arb.get('report number')} - {actual_name} - {arb.get('date')}",
-                    style='List Bullet 2'
-                )
-
-    if 'incident_reports' in all_data and all_data['incident_reports']:
-        inc_data = all_data['incident_reports']
-        real_incidents = [inc for inc in inc_data['rows'] if inc.get('report number') != 'Report Number']
-        if real_incidents:
-            action_count += 1
-            p = doc.add_paragraph()
-            p.add_run(f"3. INCIDENT - Review and assess").font.bold = True
-            for inc in real_incidents:
-                doc.add_paragraph(
-                    f"• {inc.get('nojcquy0tfl9hqih', 'Incident')} - {inc.get('date')}",
-                    style='List Bullet 2'
-                )
+    at_risk_behavior = by_type.get('At-Risk Behavior', [])
+
+    if near_misses:
+        action_count += len(near_misses)
+        w(_w_para(_w_run(f"1. NEAR MISSES - Contact {len(near_misses)} for incident investigation", bold=True)))
+        w(_w_para(_w_run('\n'.join(
+            f"• Report #{nm.get('report number')} - {nm['_observer']} - {nm.get('date')}"
+            for nm in near_misses)), style=W_BULLET_2))
+
+    if at_risk_behavior:
+        action_count += len(at_risk_behavior)
+        w(_w_para(_w_run(f"2. AT-RISK BEHAVIORS - Schedule coaching for {len(at_risk_behavior)}", bold=True)))
+        w(_w_para(_w_run('\n'.join(
+            f"• Report #{arb.get('report number')} - {arb['_observer']} - {arb.get('date')}"
+            for arb in at_risk_behavior)), style=W_BULLET_2))
+
+    if real_incidents:
+        action_count += 1
+        w(_w_para(_w_run("3. INCIDENT - Review and assess", bold=True)))
+        w(_w_para(_w_run('\n'.join(
+            f"• {inc.get('nojcquy0tfl9hqih', 'Incident')} - {inc.get('date')}"
+            for inc in real_incidents)), style=W_BULLET_2))
 
     if action_count == 0:
-        p = doc.add_paragraph("✅ No immediate action items - Safe day!")
-        p.runs[0].font.color.rgb = COLORS['safe']
-        p.runs[0].font.bold = True
+        w(_w_para(_w_run("✅ No immediate action items - Safe day!", bold=True, color=c_safe)))
 
-    doc.add_paragraph()
+    w(W_EMPTY)
 
     # ========================================================================
     # CRITICAL ITEMS (Incidents, RCA, Near Misses) - ONLY IF THEY EXIST
     # ========================================================================
 
     # INCIDENT REPORTS
-    if 'incident_reports' in all_data and all_data['incident_reports']:
-        inc_data = all_data['incident_reports']
-        real_incidents = [inc for inc in inc_data['rows'] if inc.get('report number') != 'Report Number']
-
-        if real_incidents:
-            doc.add_page_break()
-            add_heading(doc, f"INCIDENT REPORTS ({len(real_incidents)}) - CRITICAL", 1, COLORS['critical'])
-            doc.add_paragraph()
+    if real_incidents:
+        w(W_PAGE_BREAK)
+        w(_w_heading(f"INCIDENT REPORTS ({len(real_incidents)}) - CRITICAL", 1, c_critical))
+        w(W_EMPTY)
 
-            for i, inc in enumerate(real_incidents, 1):
-                add_heading(doc, f"Incident #{i}: Report #{inc.get('report number')}", 2, COLORS['critical'])
+        for i, inc in enumerate(real_incidents, 1):
+            w(_w_heading(f"Incident #{i}: Report #{inc.get('report number')}", 2, c_critical))
+            w(_w_field("Date: ", inc.get('date', 'N/A')))
+            w(_w_field("Type: ", inc.get('nojcquy0tfl9hqih', inc.get('report', 'N/A'))))
+            w(_w_field("Location: ", inc.get('pk6qj0kiu9vek20v', 'N/A')))
 
-                p = doc.add_paragraph()
-                p.add_run("Date: ").font.bold = True
-                p.add_run(inc.get('date', 'N/A'))
+            desc = inc.get('313e9txgrof0uute', '')
+            if desc:
+                w(_w_field("Description:\n", desc))
 
-                p = doc.add_paragraph()
-                p.add_run("Type: ").font.bold = True
-                p.add_run(inc.get('nojcquy0tfl9hqih', inc.get('report', 'N/A')))
+            link = inc.get('link', '')
+            if link and link != 'Link':
+                w(_w_field("Link: ", link))
 
-                p = doc.add_paragraph()
-                p.add_run("Location: ").font.bold = True
-                p.add_run(inc.get('pk6qj0kiu9vek20v', 'N/A'))
-
-                desc = inc.get('313e9txgrof0uute', '')
-                if desc:
-                    p = doc.add_paragraph()
-                    p.add_run("Description:\n").font.bold = True
-                    p.add_run(desc)
-
-                link = inc.get('link', '')
-                if link and link != 'Link':
-                    p = doc.add_paragraph()
-                    p.add_run("Link: ").font.bold = True
-                    p.add_run(link)
-
-                doc.add_paragraph()
+            w(W_EMPTY)
 
     # ROOT CAUSE ANALYSIS
-    if 'rca' in all_data and all_data['rca']:
-        rca_data = all_data['rca']
-        real_rca = [r for r in rca_data['rows'] if r.get('report number') != 'Report Number']
-
-        if real_rca:
-            doc.add_page_break()
-            add_heading(doc, f"ROOT CAUSE ANALYSIS ({len(real_rca)})", 1, COLORS['critical'])
-            doc.add_paragraph()
-
-            for i, rca in enumerate(real_rca, 1):
-                add_heading(doc, f"RCA #{i}: Report #{rca.get('report number')}", 2, COLORS['critical'])
+    if real_rca:
+        w(W_PAGE_BREAK)
+        w(_w_heading(f"ROOT CAUSE ANALYSIS ({len(real_rca)})", 1, c_critical))
+        w(W_EMPTY)
 
-                p = doc.add_paragraph()
-                p.add_run("Date: ").font.bold = True
-                p.add_run(rca.get('date', 'N/A'))
+        for i, rca in enumerate(real_rca, 1):
+            w(_w_heading(f"RCA #{i}: Report #{rca.get('report number')}", 2, c_critical))
+            w(_w_field("Date: ", rca.get('date', 'N/A')))
+            w(_w_field("Description: ", rca.get('description', 'N/A')))
 
-                p = doc.add_paragraph()
-                p.add_run("Description: ").font.bold = True
-                p.add_run(rca.get('description', 'N/A'))
+            link = rca.get('link', '')
+            if link and link != 'Link':
+                w(_w_field("Link: ", link))
 
-                link = rca.get('link', '')
-                if link and link != 'Link':
-                    p = doc.add_paragraph()
-                    p.add_run("Link: ").font.bold = True
-                    p.add_run(link)
-
-                doc.add_paragraph()
+            w(W_EMPTY)
 
     # NEAR MISSES
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        obs_analysis = all_data['observation_analysis']
-        near_misses = obs_analysis['by_type'].get('Near Miss', [])
-
-        if near_misses:
-            doc.add_page_break()
-            add_heading(doc, f"NEAR MISSES ({len(near_misses)}) - IMMEDIATE ACTION REQUIRED", 1, COLORS['critical'])
-            doc.add_paragraph()
-
-            for i, nm in enumerate(near_misses, 1):
-                actual_name = get_actual_observer_name(nm)
-                add_heading(doc, f"{i}. Report #{nm.get('report number')} - {actual_name}", 3, COLORS['critical'])
-
-                p = doc.add_paragraph()
-                p.add_run("Date: ").font.bold = True
-                p.add_run(nm.get('date', 'N/A'))
-
-                p = doc.add_paragraph()
-                p.add_run("Yard: ").font.bold = True
-                p.add_run(nm.get('7vj2l992y7fwqhwz', 'N/A'))
-
-                p = doc.add_paragraph()
-                p.add_run("Location: ").font.bold = True
-                p.add_run(nm.get('lg5pnj4chjadnv46', 'N/A'))
-
-                p = doc.add_paragraph()
-                p.add_run("Description: ").font.bold = True
-                p.add_run(nm.get('uncbcge9x8vow9pn', 'No description'))
-
-                corrective = nm.get('dpy2klalngsr7ek9', '')
-                if corrective and corrective.strip():
-                    p = doc.add_paragraph()
-                    p.add_run("Status: ").font.bold = True
-                    p.add_run("CLOSED")
-                else:
-                    p = doc.add_paragraph()
-                    p.add_run("Status: ").font.bold = True
-                    run = p.add_run("OPEN - ACTION REQUIRED")
-                    run.font.color.rgb = COLORS['critical']
+    if near_misses:
+        w(W_PAGE_BREAK)
+        w(_w_heading(f"NEAR MISSES ({len(near_misses)}) - IMMEDIATE ACTION REQUIRED", 1, c_critical))
+        w(W_EMPTY)
+
+        for i, nm in enumerate(near_misses, 1):
+            actual_name = nm['_observer']
+            w(_w_heading(f"{i}. Report #{nm.get('report number')} - {actual_name}", 3, c_critical))
+            w(_w_field("Date: ", nm.get('date', 'N/A')))
+            w(_w_field("Yard: ", nm.get('7vj2l992y7fwqhwz', 'N/A')))
+            w(_w_field("Location: ", nm.get('lg5pnj4chjadnv46', 'N/A')))
+            w(_w_field("Description: ", nm.get('uncbcge9x8vow9pn', 'No description')))
+
+            if nm['_has_corrective']:
+                w(_w_field("Status: ", "CLOSED"))
+            else:
+                w(_w_para(_w_run("Status: ", bold=True),
+                          _w_run("OPEN - ACTION REQUIRED", color=c_critical)))
 
-                link = nm.get('link', '')
-                if link and link != 'Link':
-                    p = doc.add_paragraph()
-                    p.add_run("Link: ").font.bold = True
-                    p.add_run(link)
+            link = nm.get('link', '')
+            if link and link != 'Link':
+                w(_w_field("Link: ", link))
 
-                doc.add_paragraph()
+            w(W_EMPTY)
 
     # ========================================================================
     # OPEN ITEMS TRACKING (At-Risk Conditions & Procedures ONLY)
     # ========================================================================
 
-    add_heading(doc, "OPEN ITEMS TRACKING - CORRECTIVE ACTIONS NEEDED", 1, COLORS['warning'])
-
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        obs_analysis = all_data['observation_analysis']
+    w(_w_heading("OPEN ITEMS TRACKING - CORRECTIVE ACTIONS NEEDED", 1, c_warning))
 
+    if obs_analysis:
         # Only At-Risk Conditions and Procedures (NOT Near Misses - they have their own section)
-        pending_items = []
-        for obs_type, obs_list in obs_analysis['by_type'].items():
-            if obs_type in ['At-Risk Condition', 'At-Risk Procedure']:
-                for obs in obs_list:
-                    corrective = obs.get('dpy2klalngsr7ek9', '')
-                    if not corrective or not corrective.strip():
-                        pending_items.append({
-                            'type': obs_type,
-                            'report_num': obs.get('report number'),
-                            'person': get_actual_observer_name(obs),
-                            'date': obs.get('date'),
-                            'yard': obs.get('7vj2l992y7fwqhwz', 'Unknown'),
-                            'location': obs.get('lg5pnj4chjadnv46', 'Unknown'),
-                            'description': obs.get('uncbcge9x8vow9pn', 'No description')[:80],
-                            'link': obs.get('link', '')
-                        })
+        pending_items = obs_analysis['pending']
 
         if pending_items:
-            p = doc.add_paragraph()
-            p.add_run(f"Pending Corrective Actions: {len(pending_items)} items").font.bold = True
-            doc.add_paragraph()
-
-            for item in pending_items:
-                p = doc.add_paragraph()
-                run = p.add_run(f"Report #{item['report_num']} - {item['type']}")
-                run.font.bold = True
-                run.font.color.rgb = COLORS['critical']
-
-                doc.add_paragraph(f"Person: {item['person']}", style='List Bullet')
-                doc.add_paragraph(f"Date: {item['date']}", style='List Bullet')
-                doc.add_paragraph(f"Yard: {item['yard']}", style='List Bullet')
-                doc.add_paragraph(f"Location: {item['location']}", style='List Bullet')
-                doc.add_paragraph(f"Issue: {item['description']}", style='List Bullet')
-                doc.add_paragraph(f"Assigned To: TBD | Deadline: TBD", style='List Bullet')
-
-                if item['link']:
-                    doc.add_paragraph(f"Link: {item['link']}", style='List Bullet')
-
-                doc.add_paragraph()
+            w(_w_para(_w_run(f"Pending Corrective Actions: {len(pending_items)} items", bold=True)))
+            w(W_EMPTY)
+
+            for obs_type, obs in pending_items:
+                w(_w_para(_w_run(f"Report #{obs.get('report number')} - {obs_type}", bold=True, color=c_critical)))
+                w(_w_para(_w_run(f"Person: {obs['_observer']}"), style=W_BULLET))
+                w(_w_para(_w_run(f"Date: {obs.get('date')}"), style=W_BULLET))
+                w(_w_para(_w_run(f"Yard: {obs.get('7vj2l992y7fwqhwz', 'Unknown')}"), style=W_BULLET))
+                w(_w_para(_w_run(f"Location: {obs.get('lg5pnj4chjadnv46', 'Unknown')}"), style=W_BULLET))
+                w(_w_para(_w_run(f"Issue: {obs['_desc80']}"), style=W_BULLET))
+                w(_w_para(_w_run("Assigned To: TBD | Deadline: TBD"), style=W_BULLET))
+
+                link = obs.get('link', '')
+                if link:
+                    w(_w_para(_w_run(f"Link: {link}"), style=W_BULLET))
+
+                w(W_EMPTY)
         else:
-            p = doc.add_paragraph("✅ All corrective actions completed!")
-            p.runs[0].font.color.rgb = COLORS['safe']
+            w(_w_para(_w_run("✅ All corrective actions completed!", color=c_safe)))
 
-    doc.add_paragraph()
+    w(W_EMPTY)
 
     # ========================================================================
     # DATA QUALITY ALERT
     # ========================================================================
 
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        obs_analysis = all_data['observation_analysis']
+    if obs_analysis:
         miscategorized = obs_analysis.get('miscategorized', [])
 
         if miscategorized:
-            add_heading(doc, f"⚠️ DATA QUALITY ALERT - {len(miscategorized)} MISCATEGORIZED", 1, COLORS['warning'])
-            doc.add_paragraph("These observations were filed as the wrong type:")
-            doc.add_paragraph()
+            w(_w_heading(f"⚠️ DATA QUALITY ALERT - {len(miscategorized)} MISCATEGORIZED", 1, c_warning))
+            w(_w_para(_w_run("These observations were filed as the wrong type:")))
+            w(W_EMPTY)
 
             for item in miscategorized:
-                p = doc.add_paragraph()
-                run = p.add_run(f"Report #{item['report_num']}")
-                run.font.bold = True
+                w(_w_para(_w_run(f"Report #{item['report_num']}", bold=True)))
+                w(_w_para(_w_run(f"Current Type: {item['type']}"), style=W_BULLET))
+                w(_w_para(_w_run(f"Should Be: {item['actual_type']}"), style=W_BULLET))
+                w(_w_para(_w_run(f"Text: '{item['description']}'"), style=W_BULLET))
+                w(_w_para(_w_run(f"Person: {item['observer']}"), style=W_BULLET))
+                w(_w_para(_w_run("Action: Reclassify in KPA"), style=W_BULLET))
+                w(W_EMPTY)
 
-                doc.add_paragraph(f"Current Type: {item['type']}", style='List Bullet')
-                doc.add_paragraph(f"Should Be: {item['actual_type']}", style='List Bullet')
-                doc.add_paragraph(f"Text: '{item['description']}'", style='List Bullet')
-                doc.add_paragraph(f"Person: {item['observer']}", style='List Bullet')
-                doc.add_paragraph(f"Action: Reclassify in KPA", style='List Bullet')
-
-                doc.add_paragraph()
-
-            doc.add_paragraph()
+            w(W_EMPTY)
 
     # ========================================================================
     # HOTSPOT ANALYSIS - Uses ACTUAL observer name (Name field), not system observer
     # ========================================================================
 
-    add_heading(doc, "HOTSPOT ANALYSIS", 1)
-
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        obs_analysis = all_data['observation_analysis']
-
-        # CRITICAL: Use get_actual_observer_name() for ACTUAL person observed
-        # NOT the system observer field (which includes James Barnett, Shelly Batts, etc. who are just data entry)
-        names = []
-        for obs_list in obs_analysis['by_type'].values():
-            for obs in obs_list:
-                actual_name = get_actual_observer_name(obs)
-                if actual_name and actual_name != 'Unknown':
-                    names.append(actual_name)
+    w(_w_heading("HOTSPOT ANALYSIS", 1))
 
-        name_counts = Counter(names)
+    if obs_analysis:
+        name_counts = obs_analysis['hotspot']
 
         if name_counts:
-            p = doc.add_paragraph()
-            p.add_run("Most Active Observers (based on actual Name field):").font.bold = True
+            w(_w_para(_w_run("Most Active Observers (based on actual Name field):", bold=True)))
             for name, count in name_counts.most_common(5):
                 if name and name != 'Unknown':
-                    doc.add_paragraph(f"{name}: {count} observations ⭐", style='List Bullet')
+                    w(_w_para(_w_run(f"{name}: {count} observations ⭐"), style=W_BULLET))
 
-    doc.add_paragraph()
+    w(W_EMPTY)
 
     # ========================================================================
     # INCIDENT TIMING
     # ========================================================================
 
-    add_heading(doc, "INCIDENT TIMING ANALYSIS", 1)
+    w(_w_heading("INCIDENT TIMING ANALYSIS", 1))
 
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        obs_analysis = all_data['observation_analysis']
-
-        shift_counts = {'Day Shift (8 AM-4 PM)': 0, 'Night Shift (4 PM-Midnight)': 0, 'Overnight (0-8 AM)': 0}
-
-        for obs_list in obs_analysis['by_type'].values():
-            for obs in obs_list:
-                shift = get_shift(obs.get('date', ''))
-                if shift in shift_counts:
-                    shift_counts[shift] += 1
-
-        for shift, count in shift_counts.items():
+    if obs_analysis:
+        for shift, count in obs_analysis['shift_counts'].items():
             if count > 0:
-                doc.add_paragraph(f"{shift}: {count} observations", style='List Bullet')
+                w(_w_para(_w_run(f"{shift}: {count} observations"), style=W_BULLET))
 
-    doc.add_paragraph()
+    w(W_EMPTY)
 
     # ========================================================================
     # ASSESSMENT & AUDIT ANALYSIS (after Timing, before At-Risk Conditions)
     # ========================================================================
 
     if 'assessment_analysis' in all_data and all_data['assessment_analysis']:
+        _append_body_xml(doc, parts)
         try:
             add_assessment_analysis_section(doc, all_data['assessment_analysis'])
         except Exception as e:
@@ -1720,143 +1967,88 @@ def build_word_document(all_data, yesterday_date):
     # AT-RISK CONDITIONS
     # ========================================================================
 
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        obs_analysis = all_data['observation_analysis']
-        conditions = obs_analysis['by_type'].get('At-Risk Condition', [])
-
-        if conditions:
-            doc.add_page_break()
-            display_count = min(10, len(conditions))
-            add_heading(doc, f"AT-RISK CONDITIONS (Top {display_count} of {len(conditions)})", 1, COLORS['warning'])
-            doc.add_paragraph()
-
-            for i, cond in enumerate(conditions[:10], 1):
-                actual_name = get_actual_observer_name(cond)
-                add_heading(doc, f"{i}. Report #{cond.get('report number')} - {actual_name}", 3)
-
-                p = doc.add_paragraph()
-                p.add_run("Date: ").font.bold = True
-                p.add_run(cond.get('date', 'N/A'))
+    conditions = by_type.get('At-Risk Condition', [])
 
-                p = doc.add_paragraph()
-                p.add_run("Location: ").font.bold = True
-                p.add_run(cond.get('lg5pnj4chjadnv46', 'N/A'))
+    if conditions:
+        w(W_PAGE_BREAK)
+        display_count = min(10, len(conditions))
+        w(_w_heading(f"AT-RISK CONDITIONS (Top {display_count} of {len(conditions)})", 1, c_warning))
+        w(W_EMPTY)
 
-                p = doc.add_paragraph()
-                p.add_run("Condition: ").font.bold = True
-                p.add_run(cond.get('uncbcge9x8vow9pn', 'No description'))
+        for i, cond in enumerate(islice(conditions, 10), 1):
+            actual_name = cond['_observer']
+            w(_w_heading(f"{i}. Report #{cond.get('report number')} - {actual_name}", 3))
+            w(_w_field("Date: ", cond.get('date', 'N/A')))
+            w(_w_field("Location: ", cond.get('lg5pnj4chjadnv46', 'N/A')))
+            w(_w_field("Condition: ", cond.get('uncbcge9x8vow9pn', 'No description')))
 
-                corrective = cond.get('dpy2klalngsr7ek9', '')
-                if corrective and corrective.strip():
-                    p = doc.add_paragraph()
-                    p.add_run("Status: ").font.bold = True
-                    run = p.add_run("CORRECTED")
-                    run.font.color.rgb = COLORS['safe']
-                else:
-                    p = doc.add_paragraph()
-                    p.add_run("Status: ").font.bold = True
-                    run = p.add_run("PENDING ACTION")
-                    run.font.color.rgb = COLORS['warning']
+            if cond['_has_corrective']:
+                w(_w_para(_w_run("Status: ", bold=True), _w_run("CORRECTED", color=c_safe)))
+            else:
+                w(_w_para(_w_run("Status: ", bold=True), _w_run("PENDING ACTION", color=c_warning)))
 
-                link = cond.get('link', '')
-                if link and link != 'Link':
-                    p = doc.add_paragraph()
-                    p.add_run("Link: ").font.bold = True
-                    p.add_run(link)
+            link = cond.get('link', '')
+            if link and link != 'Link':
+                w(_w_field("Link: ", link))
 
-                doc.add_paragraph()
+            w(W_EMPTY)
 
-            if len(conditions) > 10:
-                p = doc.add_paragraph()
-                run = p.add_run(f"... and {len(conditions) - 10} more conditions in KPA")
-                run.font.italic = True
+        if len(conditions) > 10:
+            w(_w_para(_w_run(f"... and {len(conditions) - 10} more conditions in KPA", italic=True)))
 
     # ========================================================================
     # RECOGNITION
     # ========================================================================
 
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        obs_analysis = all_data['observation_analysis']
-        recognition = obs_analysis['by_type'].get('Recognition', [])
+    recognition = by_type.get('Recognition', [])
 
-        if recognition:
-            doc.add_page_break()
-            add_heading(doc, f"SAFETY RECOGNITION - STARS ({len(recognition)})", 1, COLORS['safe'])
-            doc.add_paragraph()
+    if recognition:
+        w(W_PAGE_BREAK)
+        w(_w_heading(f"SAFETY RECOGNITION - STARS ({len(recognition)})", 1, c_safe))
+        w(W_EMPTY)
 
-            recognition_names = []
-            for rec in recognition:
-                recognition_names.append({
-                    'name': get_actual_observer_name(rec),
-                    'description': rec.get('uncbcge9x8vow9pn'),
-                })
-
-            name_counter = Counter([r['name'] for r in recognition_names])
-
-            for name, count in name_counter.most_common(10):
-                if name and name != 'Unknown':
-                    p = doc.add_paragraph()
-                    run = p.add_run(f"✅ {name}")
-                    run.font.bold = True
-                    p.add_run(f" - {count} recognition(s)")
-
-                    for rec in recognition_names:
-                        if rec['name'] == name:
-                            doc.add_paragraph(f"'{rec['description']}'", style='List Bullet')
-                            break
+        for name, count, desc in obs_analysis['recognition_top']:
+            w(_w_field(f"✅ {name}", f" - {count} recognition(s)"))
+            w(_w_para(_w_run(f"'{desc}'"), style=W_BULLET))
 
     # ========================================================================
     # ASSESSMENT & AUDIT SUMMARY (detailed table replacing old "Other Forms")
     # ========================================================================
 
+    _append_body_xml(doc, parts)
+
     if 'assessment_details' in all_data:
         try:
             add_assessment_audit_summary(doc, all_data['assessment_details'])
         except Exception as e:
             print(f"Warning: Assessment audit summary table error: {e}")
             # Fallback to simple count list
-            doc.add_page_break()
-            add_heading(doc, "OTHER SAFETY FORMS SUMMARY", 1)
-            doc.add_paragraph()
+            w(W_PAGE_BREAK)
+            w(_w_heading("OTHER SAFETY FORMS SUMMARY", 1))
+            w(W_EMPTY)
             for form_id, form_name in OTHER_FORMS:
                 data = all_data.get(f"form_{form_id}")
                 count = data['count'] if data else 0
-                p = doc.add_paragraph()
-                run = p.add_run(f"{form_name}: ")
-                run.font.bold = True
-                p.add_run(f"{count}")
+                w(_w_field(f"{form_name}: ", f"{count}"))
     else:
         # Fallback if assessment_details not generated
-        doc.add_page_break()
-        add_heading(doc, "OTHER SAFETY FORMS SUMMARY", 1)
-        doc.add_paragraph()
+        w(W_PAGE_BREAK)
+        w(_w_heading("OTHER SAFETY FORMS SUMMARY", 1))
+        w(W_EMPTY)
         for form_id, form_name in OTHER_FORMS:
             data = all_data.get(f"form_{form_id}")
             count = data['count'] if data else 0
-            p = doc.add_paragraph()
-            run = p.add_run(f"{form_name}: ")
-            run.font.bold = True
-            p.add_run(f"{count}")
+            w(_w_field(f"{form_name}: ", f"{count}"))
 
-    doc.add_paragraph()
+    w(W_EMPTY)
 
     # ========================================================================
     # FOOTER
     # ========================================================================
 
-    doc.add_paragraph()
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run = p.add_run("END OF REPORT")
-    run.font.size = Pt(10)
-    run.font.italic = True
-    run.font.color.rgb = COLORS['primary']
+    w(W_FOOTER)
 
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run = p.add_run("Butch's Rat Hole & Anchor Service Inc. | HSE Department")
-    run.font.size = Pt(9)
-    run.font.color.rgb = COLORS['secondary']
+    _append_body_xml(doc, parts)
 
     return doc
 
@@ -1875,609 +2067,668 @@ HTML_COLORS = {
 }
 
 
+# Names, yards and locations repeat across rows; typed so 1 and True stay distinct
+@lru_cache(maxsize=4096, typed=True)
 def _h(text):
     """HTML-escape text safely"""
-    return html_escape(str(text)) if text else ''
+    if not text:
+        return ''
+    if type(text) is not str:
+        text = str(text)
+    # Most values (report numbers, dates, yards) need no escaping at all
+    if '&' in text or '<' in text or '>' in text or '"' in text or "'" in text:
+        return html_escape(text)
+    return text
 
 
-def build_html_report(all_data, yesterday_date):
-    """Build HTML version of the report for email body"""
-    sections = []
+# Static report chrome and section shells, resolved against HTML_COLORS once
+# at import. build_html_report fills in the body (and any title counts) with %.
 
-    # --- Wrapper start ---
-    sections.append(f"""<html><head><meta charset="utf-8"></head>
+HTML_WRAPPER_OPEN = """<html><head><meta charset="utf-8"></head>
 <body style="margin:0;padding:0;background:#f4f4f4;">
 <table width="100%" cellpadding="0" cellspacing="0" style="background:#f4f4f4;">
 <tr><td align="center">
-<table width="700" cellpadding="0" cellspacing="0" style="background:#ffffff;border:1px solid #ddd;margin:20px auto;font-family:Arial,Helvetica,sans-serif;font-size:14px;color:#333;">""")
+<table width="700" cellpadding="0" cellspacing="0" style="background:#ffffff;border:1px solid #ddd;margin:20px auto;font-family:Arial,Helvetica,sans-serif;font-size:14px;color:#333;">"""
 
-    # --- HEADER ---
-    sections.append(f"""
+HTML_HEADER = f"""
 <tr><td style="background:{HTML_COLORS['primary']};padding:30px 40px;text-align:center;">
   <div style="font-size:16px;font-weight:bold;color:#ffffff;letter-spacing:1px;">BRHAS Safety Companies</div>
   <div style="font-size:28px;font-weight:bold;color:#ffffff;margin:10px 0;">DAILY SAFETY REPORT</div>
   <div style="font-size:13px;font-style:italic;color:#ffcccc;">HSE Management Summary</div>
-  <div style="font-size:12px;color:#ffffff;margin-top:8px;">Report Date: {yesterday_date.strftime('%A, %B %d, %Y')}</div>
-  <div style="font-size:10px;color:#ffcccc;margin-top:4px;">Generated: {datetime.now().strftime('%B %d, %Y at %H:%M:%S')}</div>
-</td></tr>""")
+  <div style="font-size:12px;color:#ffffff;margin-top:8px;">Report Date: %s</div>
+  <div style="font-size:10px;color:#ffcccc;margin-top:4px;">Generated: %s</div>
+</td></tr>"""
+
+HTML_FOOTER = f"""
+<tr><td style="background:{HTML_COLORS['secondary']};padding:20px 40px;text-align:center;">
+  <div style="color:#ffffff;font-size:11px;font-style:italic;">END OF REPORT</div>
+  <div style="color:#ffcccc;font-size:10px;margin-top:4px;">Butch's Rat Hole &amp; Anchor Service Inc. | HSE Department</div>
+</td></tr>"""
+
+HTML_WRAPPER_CLOSE = """
+</table>
+</td></tr></table>
+</body></html>"""
+
+
+def _html_section(title, color, top_border=None, underline=True):
+    """Section shell: a padded row with a colored <h2>, body left as %s"""
+    td_style = 'padding:25px 40px;'
+    if top_border:
+        td_style += f'border-top:{top_border};'
+    h2_style = f'color:{color};margin:0 0 15px 0;font-size:18px;'
+    if underline:
+        h2_style += f'border-bottom:2px solid {color};padding-bottom:5px;'
+    return f'\n<tr><td style="{td_style}">\n  <h2 style="{h2_style}">{title}</h2>\n  %s\n</td></tr>'
+
+
+HTML_STREAK = _html_section('SAFETY STREAK METRICS', HTML_COLORS['primary'])
+HTML_SUMMARY = _html_section('EXECUTIVE SUMMARY', HTML_COLORS['primary'])
+HTML_ACTIONS = _html_section('ACTION ITEMS FOR TODAY', HTML_COLORS['critical'])
+HTML_INCIDENTS = _html_section('INCIDENT REPORTS (%d) - CRITICAL', HTML_COLORS['critical'],
+                               top_border=f"3px solid {HTML_COLORS['critical']}", underline=False)
+HTML_RCA = _html_section('ROOT CAUSE ANALYSIS (%d)', HTML_COLORS['critical'],
+                         top_border=f"3px solid {HTML_COLORS['critical']}", underline=False)
+HTML_NEAR_MISSES = _html_section('NEAR MISSES (%d) - IMMEDIATE ACTION REQUIRED', HTML_COLORS['critical'],
+                                 top_border=f"3px solid {HTML_COLORS['critical']}", underline=False)
+HTML_OPEN_ITEMS = _html_section('OPEN ITEMS TRACKING - CORRECTIVE ACTIONS NEEDED', HTML_COLORS['warning'])
+HTML_DATA_QUALITY = _html_section('&#9888;&#65039; DATA QUALITY ALERT - %d MISCATEGORIZED', HTML_COLORS['warning'],
+                                  underline=False)
+HTML_HOTSPOT = _html_section('HOTSPOT ANALYSIS', HTML_COLORS['primary'])
+HTML_TIMING = _html_section('INCIDENT TIMING ANALYSIS', HTML_COLORS['primary'])
+HTML_ASSESSMENT_ANALYSIS = _html_section('ASSESSMENT &amp; AUDIT ANALYSIS', HTML_COLORS['primary'],
+                                         top_border=f"3px solid {HTML_COLORS['primary']}")
+HTML_CONDITIONS = _html_section('AT-RISK CONDITIONS (Top %d of %d)', HTML_COLORS['warning'],
+                                top_border=f"3px solid {HTML_COLORS['warning']}", underline=False)
+HTML_RECOGNITION = _html_section('SAFETY RECOGNITION - STARS (%d)', HTML_COLORS['safe'],
+                                 top_border=f"3px solid {HTML_COLORS['safe']}", underline=False)
+HTML_ASSESSMENT_SUMMARY = _html_section('ASSESSMENT &amp; AUDIT SUMMARY', HTML_COLORS['primary'],
+                                        top_border='2px solid #ddd')
+
+# Repeated rows, one % per row; _STRIPE is indexed by row parity
+_STRIPE = ('#f9f9f9', '#ffffff')
+HTML_ACTIVITY_ROW = ('<tr style="background:%s;">'
+                     '<td style="border-bottom:1px solid #eee;padding:6px;">%s</td>'
+                     '<td style="border-bottom:1px solid #eee;padding:6px;text-align:center;">%s</td>'
+                     '<td style="border-bottom:1px solid #eee;padding:6px;">%s</td>'
+                     '<td style="border-bottom:1px solid #eee;padding:6px;text-align:center;">%s</td>'
+                     '<td style="border-bottom:1px solid #eee;padding:6px;text-align:center;">%s</td></tr>')
+HTML_YARD_ROW = ('<tr style="background:%s;">'
+                 '<td style="border-bottom:1px solid #eee;padding:6px;">%s</td>'
+                 + '<td style="border-bottom:1px solid #eee;padding:6px;text-align:center;">%s</td>' * 4
+                 + '</tr>')
+HTML_OPEN_ITEM = (f'<div style="background:#fffbf0;border-left:4px solid {HTML_COLORS["warning"]};padding:12px 15px;margin:10px 0;">'
+                  f'<b style="color:{HTML_COLORS["critical"]};">Report #%s - %s</b><br>'
+                  'Person: %s | Date: %s<br>'
+                  'Yard: %s | Location: %s<br>'
+                  'Issue: %s<br>'
+                  'Assigned To: TBD | Deadline: TBD<br>'
+                  '%s</div>')
+HTML_KPA_LINK = '<a href="%(url)s">View in KPA</a><br>'
+HTML_LINK_ROW = '<b>Link:</b> <a href="%(url)s">%(url)s</a><br>'
+
+# Per-item callout boxes, with the opening tag and title style fully resolved
+# per tint so the row loops only add the row's own text
+CARD_BG = {'critical': '#fff5f5', 'warning': '#fffbf0', 'safe': '#f0fff0'}
+CARD_OPEN = {level: f'<div style="background:{bg};border-left:4px solid {HTML_COLORS[level]};padding:12px 15px;margin:10px 0;">'
+             for level, bg in CARD_BG.items()}
+CARD_TITLE = {level: f'<b style="color:{HTML_COLORS[level]};">' for level in CARD_BG}
+# Assessment findings use the same tints on a tighter margin
+FINDING_OPEN = {level: f'<div style="background:{CARD_BG[level]};border-left:4px solid {HTML_COLORS[level]};padding:12px 15px;margin:8px 0;">'
+                for level in ('critical', 'warning')}
+
+# Status spans indexed by the row's _has_corrective flag (False, True)
+NM_STATUS = (f'<span style="color:{HTML_COLORS["critical"]};"><b>OPEN - ACTION REQUIRED</b></span>',
+             '<span style="color:#008000;"><b>CLOSED</b></span>')
+COND_STATUS = (f'<span style="color:{HTML_COLORS["warning"]};"><b>PENDING ACTION</b></span>',
+               f'<span style="color:{HTML_COLORS["safe"]};"><b>CORRECTED</b></span>')
+
+
+def _card(level, body):
+    """Callout box for one incident, near miss, condition, etc., tinted by level"""
+    return CARD_OPEN[level] + body + '</div>'
+
+
+def _link_row(link, template=HTML_LINK_ROW):
+    """Escaped KPA link line for a card, or '' for a missing or header-echo link"""
+    if link and link != 'Link':
+        return template % {'url': _h(link)}
+    return ''
+
+
+COMP_OK_TMPL = f'<span style="color:{HTML_COLORS["safe"]};">&#9989; %.0f%%</span>'
+COMP_WARN_TMPL = f'<span style="color:{HTML_COLORS["warning"]};">&#128993; %.0f%%</span>'
+COMP_BAD_TMPL = f'<span style="color:{HTML_COLORS["critical"]};">&#128308; %.0f%%</span>'
+
+
+def _comp_badge(rate):
+    """Compliance percentage colored green (90+), amber (70+) or red"""
+    if rate >= 90:
+        return COMP_OK_TMPL % rate
+    if rate >= 70:
+        return COMP_WARN_TMPL % rate
+    return COMP_BAD_TMPL % rate
+
+
+def _build_assessment_section(aa):
+    """Assessment & audit analysis section for the HTML report, or '' when there is no data"""
+    if not aa.get('has_data'):
+        return ''
+
+    c_primary = HTML_COLORS['primary']
+    c_secondary = HTML_COLORS['secondary']
+    c_critical = HTML_COLORS['critical']
+    c_warning = HTML_COLORS['warning']
+    c_safe = HTML_COLORS['safe']
+    h = _h
+
+    aa_html = []
+
+    # Header stats
+    aa_html.append(f'<b>Total Assessments:</b> {aa["total_assessments"]} | ')
+    aa_html.append(f'<b>Total Findings:</b> {aa["total_findings"]}<br><br>')
+
+    # Activity Summary Table
+    if aa['activity_summary']:
+        aa_html.append(f'<h3 style="color:{c_secondary};margin:10px 0 8px 0;font-size:15px;">Assessment Activity Summary</h3>')
+        aa_html.append('<table width="100%" cellpadding="6" cellspacing="0" style="border-collapse:collapse;font-size:13px;margin-bottom:15px;">')
+        aa_html.append(f'<tr style="background:{c_secondary};color:#ffffff;">')
+        aa_html.append('<th style="text-align:left;padding:8px;">Form</th>')
+        aa_html.append('<th style="text-align:center;padding:8px;">Count</th>')
+        aa_html.append('<th style="text-align:left;padding:8px;">Assessor(s)</th>')
+        aa_html.append('<th style="text-align:center;padding:8px;">Findings</th>')
+        aa_html.append('<th style="text-align:center;padding:8px;">Compliance</th></tr>')
+
+        aa_html.append(''.join(
+            HTML_ACTIVITY_ROW % (
+                _STRIPE[i & 1],
+                h(s['form_name']),
+                s['count'],
+                h(', '.join(s['assessors'][:3]))
+                + (f' +{len(s["assessors"]) - 3}' if len(s['assessors']) > 3 else ''),
+                s['findings_count'],
+                _comp_badge(s['compliance_rate']),
+            )
+            for i, s in enumerate(aa['activity_summary'])))
+
+        aa_html.append('</table>')
+
+    # Compliance by Yard Table
+    if aa['compliance_by_yard']:
+        aa_html.append(f'<h3 style="color:{c_secondary};margin:15px 0 8px 0;font-size:15px;">Compliance by Yard</h3>')
+        aa_html.append('<table width="100%" cellpadding="6" cellspacing="0" style="border-collapse:collapse;font-size:13px;margin-bottom:15px;">')
+        aa_html.append(f'<tr style="background:{c_secondary};color:#ffffff;">')
+        aa_html.append('<th style="text-align:left;padding:8px;">Yard</th>')
+        aa_html.append('<th style="text-align:center;padding:8px;">Total</th>')
+        aa_html.append('<th style="text-align:center;padding:8px;">Compliant</th>')
+        aa_html.append('<th style="text-align:center;padding:8px;">Non-Compliant</th>')
+        aa_html.append('<th style="text-align:center;padding:8px;">Status</th></tr>')
+
+        sorted_yards = sorted(aa['compliance_by_yard'].items(),
+                              key=_by_non_compliant, reverse=True)
+        aa_html.append(''.join(
+            HTML_YARD_ROW % (
+                _STRIPE[i & 1],
+                h(yard),
+                info['total'],
+                info['compliant'],
+                info['non_compliant'],
+                _comp_badge(info['compliant'] / info['total'] * 100) if info['total'] > 0 else 'N/A',
+            )
+            for i, (yard, info) in enumerate(sorted_yards)))
+
+        aa_html.append('</table>')
+
+    # Critical Findings
+    critical = aa['findings_by_severity']['critical']
+    high = aa['findings_by_severity']['high']
+    if critical or high:
+        aa_html.append(f'<h3 style="color:{c_critical};margin:15px 0 8px 0;font-size:15px;">Critical Findings - Immediate Attention</h3>')
+
+        for f in critical:
+            aa_html.append(FINDING_OPEN['critical'])
+            aa_html.append(f'{CARD_TITLE["critical"]}&#128308; CRITICAL:</b> {h(f["description"])}<br>')
+            aa_html.append(f'Form: {h(f["form_name"])} | Assessor: {h(f["assessor"])} | Yard: {h(f["yard"])}<br>')
+            if f['link']:
+                aa_html.append(f'<a href="{h(f["link"])}">View in KPA</a>')
+            aa_html.append('</div>')
+
+        for f in islice(high, 5):
+            aa_html.append(FINDING_OPEN['warning'])
+            aa_html.append(f'{CARD_TITLE["warning"]}&#128993; HIGH:</b> {h(f["description"])}<br>')
+            aa_html.append(f'Form: {h(f["form_name"])} | Yard: {h(f["yard"])}<br>')
+            if f['link']:
+                aa_html.append(f'<a href="{h(f["link"])}">View in KPA</a>')
+            aa_html.append('</div>')
+
+        if len(high) > 5:
+            aa_html.append(f'<p style="font-style:italic;">... and {len(high) - 5} more high-severity findings</p>')
+    else:
+        medium = aa['findings_by_severity']['medium']
+        low = aa['findings_by_severity']['low']
+        if medium or low:
+            aa_html.append(f'<p><b>No critical or high-severity findings.</b> {len(medium)} medium, {len(low)} low-severity items noted.</p>')
+        else:
+            aa_html.append(f'<p style="color:{c_safe};"><b>&#9989; No findings - All assessments passed!</b></p>')
+
+    # Top Assessors
+    if aa['assessor_stats']:
+        aa_html.append(f'<h3 style="color:{c_safe};margin:15px 0 8px 0;font-size:15px;">Top Performing Assessors</h3>')
+        sorted_a = sorted(aa['assessor_stats'].items(), key=_by_total, reverse=True)
+        rank = 0
+        for name, stats in islice(sorted_a, 10):
+            if name == 'Unknown':
+                continue
+            rank += 1
+            star = '&#11088; ' if rank <= 3 else ''
+            divs = ', '.join(stats['divisions']) if stats['divisions'] else 'N/A'
+            finding_note = f' | {stats["findings_found"]} finding(s)' if stats['findings_found'] > 0 else ''
+            aa_html.append(f'<div style="margin:4px 0 4px 15px;">{star}<b>{h(name)}</b> - {stats["total"]} assessment(s) | {h(divs)}{finding_note}</div>')
+
+    # Corrective Actions
+    if aa['corrective_actions']:
+        aa_html.append(f'<h3 style="color:{c_warning};margin:15px 0 8px 0;font-size:15px;">Corrective Actions ({len(aa["corrective_actions"])} open)</h3>')
+        for i, ca in enumerate(islice(aa['corrective_actions'], 5), 1):
+            aa_html.append(f'<div style="background:#fffbf0;border-left:4px solid {c_warning};padding:10px 15px;margin:6px 0;">')
+            aa_html.append(f'<b>{i}. {h(ca["description"])}</b><br>')
+            aa_html.append(f'{h(ca["form_name"])} | {h(ca["yard"])} | By: {h(ca["assessor"])}<br>')
+            if ca['link']:
+                aa_html.append(f'<a href="{h(ca["link"])}">View in KPA</a>')
+            aa_html.append('</div>')
+        if len(aa['corrective_actions']) > 5:
+            aa_html.append(f'<p style="font-style:italic;">... and {len(aa["corrective_actions"]) - 5} more</p>')
+
+    # Trends
+    if aa['trends']:
+        aa_html.append(f'<h3 style="color:{c_primary};margin:15px 0 8px 0;font-size:15px;">Trends &amp; Patterns</h3>')
+        aa_html.append('<ul style="margin:5px 0;">')
+        for trend in aa['trends']:
+            aa_html.append(f'<li>&#128202; {h(trend)}</li>')
+        aa_html.append('</ul>')
+
+    # Recommendations
+    recs = aa['recommendations']
+    if any([recs['immediate'], recs['this_week'], recs['monthly']]):
+        aa_html.append(f'<h3 style="color:{c_primary};margin:15px 0 8px 0;font-size:15px;">Recommended Actions for Leadership</h3>')
+
+        if recs['immediate']:
+            aa_html.append(f'<div style="margin:5px 0;"><b style="color:{c_critical};">&#128308; IMMEDIATE:</b></div>')
+            aa_html.append('<ul style="margin:3px 0;">')
+            for r in recs['immediate']:
+                aa_html.append(f'<li>{h(r)}</li>')
+            aa_html.append('</ul>')
+
+        if recs['this_week']:
+            aa_html.append(f'<div style="margin:5px 0;"><b style="color:{c_warning};">&#128993; THIS WEEK:</b></div>')
+            aa_html.append('<ul style="margin:3px 0;">')
+            for r in recs['this_week']:
+                aa_html.append(f'<li>{h(r)}</li>')
+            aa_html.append('</ul>')
+
+        if recs['monthly']:
+            aa_html.append('<div style="margin:5px 0;"><b>&#128202; MONTH-OVER-MONTH:</b></div>')
+            aa_html.append('<ul style="margin:3px 0;">')
+            for r in recs['monthly']:
+                aa_html.append(f'<li>{h(r)}</li>')
+            aa_html.append('</ul>')
+
+    return HTML_ASSESSMENT_ANALYSIS % ''.join(aa_html)
+
 
-    # --- SAFETY STREAK METRICS ---
+def _build_streak_section(obs_analysis, real_incidents):
+    """Safety streak metrics"""
     streak_rows = []
     streak_rows.append('<b>Days Since Lost-Time Injury:</b> 127 days &#9989;')
     streak_rows.append('<b>Days Since Recordable Incident:</b> 89 days &#9989;')
 
-    if 'incident_reports' in all_data and all_data['incident_reports']:
-        real_incidents = [inc for inc in all_data['incident_reports']['rows'] if inc.get('report number') != 'Report Number']
-        if real_incidents:
-            streak_rows.append(f'<b>Days Since Any Incident:</b> <span style="color:{HTML_COLORS["critical"]};">0 days (New incident reported)</span>')
+    if real_incidents:
+        streak_rows.append(f'<b>Days Since Any Incident:</b> <span style="color:{HTML_COLORS["critical"]};">0 days (New incident reported)</span>')
 
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        near_miss = all_data['observation_analysis']['type_counts'].get('Near Miss', 0)
+    if obs_analysis:
+        near_miss = obs_analysis['type_counts'].get('Near Miss', 0)
         if near_miss > 0:
             streak_rows.append(f'<b>Days Since Near-Miss Report:</b> <span style="color:{HTML_COLORS["safe"]};">0 days (Early warning system active) &#9989;</span>')
         else:
             streak_rows.append('<b>Days Since Near-Miss Report:</b> N/A')
 
-    sections.append(f"""
-<tr><td style="padding:25px 40px;">
-  <h2 style="color:{HTML_COLORS['primary']};margin:0 0 15px 0;font-size:18px;border-bottom:2px solid {HTML_COLORS['primary']};padding-bottom:5px;">SAFETY STREAK METRICS</h2>
-  {'<br>'.join(streak_rows)}
-</td></tr>""")
+    return HTML_STREAK % '<br>'.join(streak_rows)
+
+
+def _build_summary_section(obs_analysis, real_incidents):
+    """Executive summary: observation totals by type plus incident count"""
+    c_critical = HTML_COLORS['critical']
+    c_warning = HTML_COLORS['warning']
+    c_safe = HTML_COLORS['safe']
 
-    # --- EXECUTIVE SUMMARY ---
-    summary_html = ''
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        obs = all_data['observation_analysis']
-        summary_html += f'<b>Total Observations:</b> {obs["total"]}<br><br>'
+    summary_html = []
+    if obs_analysis:
+        type_counts = obs_analysis['type_counts']
+        summary_html.append(f'<b>Total Observations:</b> {obs_analysis["total"]}<br><br>')
 
-        near_miss_count = obs['type_counts'].get('Near Miss', 0)
-        at_risk_behavior_count = obs['type_counts'].get('At-Risk Behavior', 0)
-        at_risk_condition_count = obs['type_counts'].get('At-Risk Condition', 0)
-        at_risk_procedure_count = obs['type_counts'].get('At-Risk Procedure', 0)
-        recognition_count = obs['type_counts'].get('Recognition', 0)
+        near_miss_count = type_counts.get('Near Miss', 0)
+        at_risk_behavior_count = type_counts.get('At-Risk Behavior', 0)
+        at_risk_condition_count = type_counts.get('At-Risk Condition', 0)
+        at_risk_procedure_count = type_counts.get('At-Risk Procedure', 0)
+        recognition_count = type_counts.get('Recognition', 0)
 
         if near_miss_count > 0:
-            summary_html += f'<div style="color:{HTML_COLORS["critical"]};margin:4px 0 4px 20px;">&#128308; NEAR MISSES: {near_miss_count}</div>'
+            summary_html.append(f'<div style="color:{c_critical};margin:4px 0 4px 20px;">&#128308; NEAR MISSES: {near_miss_count}</div>')
         if at_risk_behavior_count > 0:
-            summary_html += f'<div style="color:{HTML_COLORS["critical"]};margin:4px 0 4px 20px;">&#128308; AT-RISK BEHAVIOR: {at_risk_behavior_count}</div>'
+            summary_html.append(f'<div style="color:{c_critical};margin:4px 0 4px 20px;">&#128308; AT-RISK BEHAVIOR: {at_risk_behavior_count}</div>')
         if at_risk_condition_count > 0:
-            summary_html += f'<div style="color:{HTML_COLORS["warning"]};margin:4px 0 4px 20px;">&#128992; AT-RISK CONDITIONS: {at_risk_condition_count}</div>'
+            summary_html.append(f'<div style="color:{c_warning};margin:4px 0 4px 20px;">&#128992; AT-RISK CONDITIONS: {at_risk_condition_count}</div>')
         if at_risk_procedure_count > 0:
-            summary_html += f'<div style="color:{HTML_COLORS["warning"]};margin:4px 0 4px 20px;">&#128992; AT-RISK PROCEDURES: {at_risk_procedure_count}</div>'
+            summary_html.append(f'<div style="color:{c_warning};margin:4px 0 4px 20px;">&#128992; AT-RISK PROCEDURES: {at_risk_procedure_count}</div>')
         if recognition_count > 0:
-            summary_html += f'<div style="color:{HTML_COLORS["safe"]};margin:4px 0 4px 20px;">&#9989; SAFETY RECOGNITION: {recognition_count}</div>'
+            summary_html.append(f'<div style="color:{c_safe};margin:4px 0 4px 20px;">&#9989; SAFETY RECOGNITION: {recognition_count}</div>')
     else:
-        summary_html += '<b>Total Observations:</b> 0 - Safe day!'
+        summary_html.append('<b>Total Observations:</b> 0 - Safe day!')
 
-    if 'incident_reports' in all_data and all_data['incident_reports']:
-        real_incidents = [inc for inc in all_data['incident_reports']['rows'] if inc.get('report number') != 'Report Number']
-        if real_incidents:
-            summary_html += f'<div style="color:{HTML_COLORS["critical"]};margin:4px 0 4px 20px;">&#9888;&#65039; INCIDENT REPORTS: {len(real_incidents)}</div>'
+    if real_incidents:
+        summary_html.append(f'<div style="color:{c_critical};margin:4px 0 4px 20px;">&#9888;&#65039; INCIDENT REPORTS: {len(real_incidents)}</div>')
 
-    sections.append(f"""
-<tr><td style="padding:25px 40px;">
-  <h2 style="color:{HTML_COLORS['primary']};margin:0 0 15px 0;font-size:18px;border-bottom:2px solid {HTML_COLORS['primary']};padding-bottom:5px;">EXECUTIVE SUMMARY</h2>
-  {summary_html}
-</td></tr>""")
+    return HTML_SUMMARY % ''.join(summary_html)
 
-    # --- ACTION ITEMS ---
-    action_html = ''
-    action_count = 0
 
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        obs = all_data['observation_analysis']
-        near_misses = obs['by_type'].get('Near Miss', [])
-        at_risk_behavior = obs['by_type'].get('At-Risk Behavior', [])
+def _build_actions_section(near_misses, at_risk_behavior, real_incidents):
+    """Action items for today: near misses, at-risk behaviors and incidents to follow up"""
+    h = _h
+    action_html = []
+    action_count = 0
 
-        if near_misses:
-            action_count += len(near_misses)
-            action_html += f'<b>1. NEAR MISSES - Contact {len(near_misses)} for incident investigation</b><ul style="margin:5px 0 15px 0;">'
-            for nm in near_misses:
-                action_html += f'<li>Report #{_h(nm.get("report number"))} - {_h(get_actual_observer_name(nm))} - {_h(nm.get("date"))}</li>'
-            action_html += '</ul>'
-
-        if at_risk_behavior:
-            action_count += len(at_risk_behavior)
-            action_html += f'<b>2. AT-RISK BEHAVIORS - Schedule coaching for {len(at_risk_behavior)}</b><ul style="margin:5px 0 15px 0;">'
-            for arb in at_risk_behavior:
-                action_html += f'<li>Report #{_h(arb.get("report number"))} - {_h(get_actual_observer_name(arb))} - {_h(arb.get("date"))}</li>'
-            action_html += '</ul>'
-
-    if 'incident_reports' in all_data and all_data['incident_reports']:
-        real_incidents = [inc for inc in all_data['incident_reports']['rows'] if inc.get('report number') != 'Report Number']
-        if real_incidents:
-            action_count += 1
-            action_html += '<b>3. INCIDENT - Review and assess</b><ul style="margin:5px 0 15px 0;">'
-            for inc in real_incidents:
-                action_html += f'<li>{_h(inc.get("nojcquy0tfl9hqih", "Incident"))} - {_h(inc.get("date"))}</li>'
-            action_html += '</ul>'
+    if near_misses:
+        action_count += len(near_misses)
+        action_html.append(f'<b>1. NEAR MISSES - Contact {len(near_misses)} for incident investigation</b><ul style="margin:5px 0 15px 0;">')
+        for nm in near_misses:
+            action_html.append(f'<li>Report #{h(nm.get("report number"))} - {h(nm["_observer"])} - {h(nm.get("date"))}</li>')
+        action_html.append('</ul>')
+
+    if at_risk_behavior:
+        action_count += len(at_risk_behavior)
+        action_html.append(f'<b>2. AT-RISK BEHAVIORS - Schedule coaching for {len(at_risk_behavior)}</b><ul style="margin:5px 0 15px 0;">')
+        for arb in at_risk_behavior:
+            action_html.append(f'<li>Report #{h(arb.get("report number"))} - {h(arb["_observer"])} - {h(arb.get("date"))}</li>')
+        action_html.append('</ul>')
+
+    if real_incidents:
+        action_count += 1
+        action_html.append('<b>3. INCIDENT - Review and assess</b><ul style="margin:5px 0 15px 0;">')
+        for inc in real_incidents:
+            action_html.append(f'<li>{h(inc.get("nojcquy0tfl9hqih", "Incident"))} - {h(inc.get("date"))}</li>')
+        action_html.append('</ul>')
 
     if action_count == 0:
-        action_html = f'<b style="color:{HTML_COLORS["safe"]};">&#9989; No immediate action items - Safe day!</b>'
-
-    sections.append(f"""
-<tr><td style="padding:25px 40px;">
-  <h2 style="color:{HTML_COLORS['critical']};margin:0 0 15px 0;font-size:18px;border-bottom:2px solid {HTML_COLORS['critical']};padding-bottom:5px;">ACTION ITEMS FOR TODAY</h2>
-  {action_html}
-</td></tr>""")
-
-    # --- INCIDENT REPORTS (only if they exist) ---
-    if 'incident_reports' in all_data and all_data['incident_reports']:
-        real_incidents = [inc for inc in all_data['incident_reports']['rows'] if inc.get('report number') != 'Report Number']
-        if real_incidents:
-            inc_html = ''
-            for i, inc in enumerate(real_incidents, 1):
-                inc_html += f'<div style="background:#fff5f5;border-left:4px solid {HTML_COLORS["critical"]};padding:12px 15px;margin:10px 0;">'
-                inc_html += f'<b style="color:{HTML_COLORS["critical"]};font-size:15px;">Incident #{i}: Report #{_h(inc.get("report number"))}</b><br>'
-                inc_html += f'<b>Date:</b> {_h(inc.get("date", "N/A"))}<br>'
-                inc_html += f'<b>Type:</b> {_h(inc.get("nojcquy0tfl9hqih", inc.get("report", "N/A")))}<br>'
-                inc_html += f'<b>Location:</b> {_h(inc.get("pk6qj0kiu9vek20v", "N/A"))}<br>'
-                desc = inc.get('313e9txgrof0uute', '')
-                if desc:
-                    inc_html += f'<b>Description:</b> {_h(desc)}<br>'
-                link = inc.get('link', '')
-                if link and link != 'Link':
-                    inc_html += f'<b>Link:</b> <a href="{_h(link)}">{_h(link)}</a><br>'
-                inc_html += '</div>'
-
-            sections.append(f"""
-<tr><td style="padding:25px 40px;border-top:3px solid {HTML_COLORS['critical']};">
-  <h2 style="color:{HTML_COLORS['critical']};margin:0 0 15px 0;font-size:18px;">INCIDENT REPORTS ({len(real_incidents)}) - CRITICAL</h2>
-  {inc_html}
-</td></tr>""")
-
-    # --- ROOT CAUSE ANALYSIS (only if exists) ---
-    if 'rca' in all_data and all_data['rca']:
-        real_rca = [r for r in all_data['rca']['rows'] if r.get('report number') != 'Report Number']
-        if real_rca:
-            rca_html = ''
-            for i, rca in enumerate(real_rca, 1):
-                rca_html += f'<div style="background:#fff5f5;border-left:4px solid {HTML_COLORS["critical"]};padding:12px 15px;margin:10px 0;">'
-                rca_html += f'<b style="color:{HTML_COLORS["critical"]};">RCA #{i}: Report #{_h(rca.get("report number"))}</b><br>'
-                rca_html += f'<b>Date:</b> {_h(rca.get("date", "N/A"))}<br>'
-                rca_html += f'<b>Description:</b> {_h(rca.get("description", "N/A"))}<br>'
-                link = rca.get('link', '')
-                if link and link != 'Link':
-                    rca_html += f'<b>Link:</b> <a href="{_h(link)}">{_h(link)}</a><br>'
-                rca_html += '</div>'
-
-            sections.append(f"""
-<tr><td style="padding:25px 40px;border-top:3px solid {HTML_COLORS['critical']};">
-  <h2 style="color:{HTML_COLORS['critical']};margin:0 0 15px 0;font-size:18px;">ROOT CAUSE ANALYSIS ({len(real_rca)})</h2>
-  {rca_html}
-</td></tr>""")
-
-    # --- NEAR MISSES (only if exist) ---
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        near_misses = all_data['observation_analysis']['by_type'].get('Near Miss', [])
-        if near_misses:
-            nm_html = ''
-            for i, nm in enumerate(near_misses, 1):
-                actual_name = get_actual_observer_name(nm)
-                corrective = nm.get('dpy2klalngsr7ek9', '')
-                if corrective and corrective.strip():
-                    status = '<span style="color:#008000;"><b>CLOSED</b></span>'
-                else:
-                    status = f'<span style="color:{HTML_COLORS["critical"]};"><b>OPEN - ACTION REQUIRED</b></span>'
-
-                nm_html += f'<div style="background:#fff5f5;border-left:4px solid {HTML_COLORS["critical"]};padding:12px 15px;margin:10px 0;">'
-                nm_html += f'<b style="color:{HTML_COLORS["critical"]};">{i}. Report #{_h(nm.get("report number"))} - {_h(actual_name)}</b><br>'
-                nm_html += f'<b>Date:</b> {_h(nm.get("date", "N/A"))}<br>'
-                nm_html += f'<b>Yard:</b> {_h(nm.get("7vj2l992y7fwqhwz", "N/A"))}<br>'
-                nm_html += f'<b>Location:</b> {_h(nm.get("lg5pnj4chjadnv46", "N/A"))}<br>'
-                nm_html += f'<b>Description:</b> {_h(nm.get("uncbcge9x8vow9pn", "No description"))}<br>'
-                nm_html += f'<b>Status:</b> {status}<br>'
-                link = nm.get('link', '')
-                if link and link != 'Link':
-                    nm_html += f'<b>Link:</b> <a href="{_h(link)}">{_h(link)}</a><br>'
-                nm_html += '</div>'
-
-            sections.append(f"""
-<tr><td style="padding:25px 40px;border-top:3px solid {HTML_COLORS['critical']};">
-  <h2 style="color:{HTML_COLORS['critical']};margin:0 0 15px 0;font-size:18px;">NEAR MISSES ({len(near_misses)}) - IMMEDIATE ACTION REQUIRED</h2>
-  {nm_html}
-</td></tr>""")
-
-    # --- OPEN ITEMS TRACKING ---
-    open_html = ''
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        obs = all_data['observation_analysis']
-        pending_items = []
-        for obs_type, obs_list in obs['by_type'].items():
-            if obs_type in ['At-Risk Condition', 'At-Risk Procedure']:
-                for o in obs_list:
-                    corrective = o.get('dpy2klalngsr7ek9', '')
-                    if not corrective or not corrective.strip():
-                        pending_items.append({
-                            'type': obs_type,
-                            'report_num': o.get('report number'),
-                            'person': get_actual_observer_name(o),
-                            'date': o.get('date'),
-                            'yard': o.get('7vj2l992y7fwqhwz', 'Unknown'),
-                            'location': o.get('lg5pnj4chjadnv46', 'Unknown'),
-                            'description': o.get('uncbcge9x8vow9pn', 'No description')[:80],
-                            'link': o.get('link', '')
-                        })
+        action_html = [f'<b style="color:{HTML_COLORS["safe"]};">&#9989; No immediate action items - Safe day!</b>']
+
+    return HTML_ACTIONS % ''.join(action_html)
+
+
+def _build_incidents_section(real_incidents):
+    """One card per incident report, or '' when there were none"""
+    if not real_incidents:
+        return ''
+
+    c_critical = HTML_COLORS['critical']
+    h = _h
+
+    inc_html = []
+    for i, inc in enumerate(real_incidents, 1):
+        desc = inc.get('313e9txgrof0uute', '')
+        inc_html.append(_card('critical',
+            f'<b style="color:{c_critical};font-size:15px;">Incident #{i}: Report #{h(inc.get("report number"))}</b><br>'
+            f'<b>Date:</b> {h(inc.get("date", "N/A"))}<br>'
+            f'<b>Type:</b> {h(inc.get("nojcquy0tfl9hqih", inc.get("report", "N/A")))}<br>'
+            f'<b>Location:</b> {h(inc.get("pk6qj0kiu9vek20v", "N/A"))}<br>'
+            + (f'<b>Description:</b> {h(desc)}<br>' if desc else '')
+            + _link_row(inc.get('link', ''))))
+
+    return HTML_INCIDENTS % (len(real_incidents), ''.join(inc_html))
+
+
+def _build_rca_section(real_rca):
+    """One card per root cause analysis, or '' when there were none"""
+    if not real_rca:
+        return ''
+
+    title = CARD_TITLE['critical']
+    h = _h
+
+    rca_html = []
+    for i, rca in enumerate(real_rca, 1):
+        rca_html.append(_card('critical',
+            f'{title}RCA #{i}: Report #{h(rca.get("report number"))}</b><br>'
+            f'<b>Date:</b> {h(rca.get("date", "N/A"))}<br>'
+            f'<b>Description:</b> {h(rca.get("description", "N/A"))}<br>'
+            + _link_row(rca.get('link', ''))))
+
+    return HTML_RCA % (len(real_rca), ''.join(rca_html))
+
+
+def _build_near_miss_section(near_misses):
+    """One card per near miss with its open/closed status, or '' when there were none"""
+    if not near_misses:
+        return ''
+
+    title = CARD_TITLE['critical']
+    h = _h
+
+    nm_html = []
+    for i, nm in enumerate(near_misses, 1):
+        actual_name = nm['_observer']
+        status = NM_STATUS[nm['_has_corrective']]
+
+        nm_html.append(_card('critical',
+            f'{title}{i}. Report #{h(nm.get("report number"))} - {h(actual_name)}</b><br>'
+            f'<b>Date:</b> {h(nm.get("date", "N/A"))}<br>'
+            f'<b>Yard:</b> {h(nm.get("7vj2l992y7fwqhwz", "N/A"))}<br>'
+            f'<b>Location:</b> {h(nm.get("lg5pnj4chjadnv46", "N/A"))}<br>'
+            f'<b>Description:</b> {h(nm.get("uncbcge9x8vow9pn", "No description"))}<br>'
+            f'<b>Status:</b> {status}<br>'
+            + _link_row(nm.get('link', ''))))
+
+    return HTML_NEAR_MISSES % (len(near_misses), ''.join(nm_html))
+
+
+def _build_open_items_section(obs_analysis):
+    """At-risk conditions/procedures still waiting on a corrective action"""
+    h = _h
+    open_html = []
+    if obs_analysis:
+        pending_items = obs_analysis['pending']
 
         if pending_items:
-            open_html += f'<b>Pending Corrective Actions: {len(pending_items)} items</b><br><br>'
-            for item in pending_items:
-                open_html += f'<div style="background:#fffbf0;border-left:4px solid {HTML_COLORS["warning"]};padding:12px 15px;margin:10px 0;">'
-                open_html += f'<b style="color:{HTML_COLORS["critical"]};">Report #{_h(item["report_num"])} - {_h(item["type"])}</b><br>'
-                open_html += f'Person: {_h(item["person"])} | Date: {_h(item["date"])}<br>'
-                open_html += f'Yard: {_h(item["yard"])} | Location: {_h(item["location"])}<br>'
-                open_html += f'Issue: {_h(item["description"])}<br>'
-                open_html += f'Assigned To: TBD | Deadline: TBD<br>'
-                if item['link']:
-                    open_html += f'<a href="{_h(item["link"])}">View in KPA</a><br>'
-                open_html += '</div>'
+            open_html.append(f'<b>Pending Corrective Actions: {len(pending_items)} items</b><br><br>')
+            open_html.append(''.join(
+                HTML_OPEN_ITEM % (
+                    h(o.get('report number')), h(obs_type),
+                    h(o['_observer']), h(o.get('date')),
+                    h(o.get('7vj2l992y7fwqhwz', 'Unknown')), h(o.get('lg5pnj4chjadnv46', 'Unknown')),
+                    h(o['_desc80']),
+                    HTML_KPA_LINK % {'url': h(o['link'])} if o.get('link') else '',
+                )
+                for obs_type, o in pending_items))
         else:
-            open_html = f'<b style="color:{HTML_COLORS["safe"]};">&#9989; All corrective actions completed!</b>'
+            open_html = [f'<b style="color:{HTML_COLORS["safe"]};">&#9989; All corrective actions completed!</b>']
 
-    sections.append(f"""
-<tr><td style="padding:25px 40px;">
-  <h2 style="color:{HTML_COLORS['warning']};margin:0 0 15px 0;font-size:18px;border-bottom:2px solid {HTML_COLORS['warning']};padding-bottom:5px;">OPEN ITEMS TRACKING - CORRECTIVE ACTIONS NEEDED</h2>
-  {open_html}
-</td></tr>""")
+    return HTML_OPEN_ITEMS % ''.join(open_html)
 
-    # --- DATA QUALITY ALERT (only if exists) ---
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        miscategorized = all_data['observation_analysis'].get('miscategorized', [])
-        if miscategorized:
-            dq_html = '<p>These observations were filed as the wrong type:</p>'
-            for item in miscategorized:
-                dq_html += f'<div style="background:#fffbf0;border-left:4px solid {HTML_COLORS["warning"]};padding:12px 15px;margin:10px 0;">'
-                dq_html += f'<b>Report #{_h(item["report_num"])}</b><br>'
-                dq_html += f'Current Type: {_h(item["type"])} | Should Be: {_h(item["actual_type"])}<br>'
-                dq_html += f'Text: \'{_h(item["description"])}\'<br>'
-                dq_html += f'Person: {_h(item["observer"])} | Action: Reclassify in KPA<br>'
-                dq_html += '</div>'
-
-            sections.append(f"""
-<tr><td style="padding:25px 40px;">
-  <h2 style="color:{HTML_COLORS['warning']};margin:0 0 15px 0;font-size:18px;">&#9888;&#65039; DATA QUALITY ALERT - {len(miscategorized)} MISCATEGORIZED</h2>
-  {dq_html}
-</td></tr>""")
-
-    # --- HOTSPOT ANALYSIS ---
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        obs = all_data['observation_analysis']
-        names = []
-        for obs_list in obs['by_type'].values():
-            for o in obs_list:
-                actual_name = get_actual_observer_name(o)
-                if actual_name and actual_name != 'Unknown':
-                    names.append(actual_name)
-        name_counts = Counter(names)
 
-        if name_counts:
-            hotspot_html = '<b>Most Active Observers:</b><ul style="margin:5px 0;">'
-            for name, count in name_counts.most_common(5):
-                if name and name != 'Unknown':
-                    hotspot_html += f'<li>{_h(name)}: {count} observations &#11088;</li>'
-            hotspot_html += '</ul>'
-
-            sections.append(f"""
-<tr><td style="padding:25px 40px;">
-  <h2 style="color:{HTML_COLORS['primary']};margin:0 0 15px 0;font-size:18px;border-bottom:2px solid {HTML_COLORS['primary']};padding-bottom:5px;">HOTSPOT ANALYSIS</h2>
-  {hotspot_html}
-</td></tr>""")
-
-    # --- INCIDENT TIMING ---
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        obs = all_data['observation_analysis']
-        shift_counts = {'Day Shift (8 AM-4 PM)': 0, 'Night Shift (4 PM-Midnight)': 0, 'Overnight (0-8 AM)': 0}
-        for obs_list in obs['by_type'].values():
-            for o in obs_list:
-                shift = get_shift(o.get('date', ''))
-                if shift in shift_counts:
-                    shift_counts[shift] += 1
-
-        active_shifts = {k: v for k, v in shift_counts.items() if v > 0}
-        if active_shifts:
-            timing_html = '<ul style="margin:5px 0;">'
-            for shift, count in active_shifts.items():
-                timing_html += f'<li>{_h(shift)}: {count} observations</li>'
-            timing_html += '</ul>'
-
-            sections.append(f"""
-<tr><td style="padding:25px 40px;">
-  <h2 style="color:{HTML_COLORS['primary']};margin:0 0 15px 0;font-size:18px;border-bottom:2px solid {HTML_COLORS['primary']};padding-bottom:5px;">INCIDENT TIMING ANALYSIS</h2>
-  {timing_html}
-</td></tr>""")
-
-    # --- ASSESSMENT & AUDIT ANALYSIS ---
-    if 'assessment_analysis' in all_data and all_data['assessment_analysis']:
-        try:
-            aa = all_data['assessment_analysis']
-            if aa.get('has_data'):
-                aa_html = ''
-
-                # Header stats
-                aa_html += f'<b>Total Assessments:</b> {aa["total_assessments"]} | '
-                aa_html += f'<b>Total Findings:</b> {aa["total_findings"]}<br><br>'
-
-                # Activity Summary Table
-                if aa['activity_summary']:
-                    aa_html += f'<h3 style="color:{HTML_COLORS["secondary"]};margin:10px 0 8px 0;font-size:15px;">Assessment Activity Summary</h3>'
-                    aa_html += '<table width="100%" cellpadding="6" cellspacing="0" style="border-collapse:collapse;font-size:13px;margin-bottom:15px;">'
-                    aa_html += f'<tr style="background:{HTML_COLORS["secondary"]};color:#ffffff;">'
-                    aa_html += '<th style="text-align:left;padding:8px;">Form</th>'
-                    aa_html += '<th style="text-align:center;padding:8px;">Count</th>'
-                    aa_html += '<th style="text-align:left;padding:8px;">Assessor(s)</th>'
-                    aa_html += '<th style="text-align:center;padding:8px;">Findings</th>'
-                    aa_html += '<th style="text-align:center;padding:8px;">Compliance</th></tr>'
-
-                    for i, s in enumerate(aa['activity_summary']):
-                        bg = '#f9f9f9' if i % 2 == 0 else '#ffffff'
-                        assessor_text = _h(', '.join(s['assessors'][:3]))
-                        if len(s['assessors']) > 3:
-                            assessor_text += f' +{len(s["assessors"]) - 3}'
-
-                        rate = s['compliance_rate']
-                        if rate >= 90:
-                            comp_text = f'<span style="color:{HTML_COLORS["safe"]};">&#9989; {rate:.0f}%</span>'
-                        elif rate >= 70:
-                            comp_text = f'<span style="color:{HTML_COLORS["warning"]};">&#128993; {rate:.0f}%</span>'
-                        else:
-                            comp_text = f'<span style="color:{HTML_COLORS["critical"]};">&#128308; {rate:.0f}%</span>'
-
-                        aa_html += f'<tr style="background:{bg};">'
-                        aa_html += f'<td style="border-bottom:1px solid #eee;padding:6px;">{_h(s["form_name"])}</td>'
-                        aa_html += f'<td style="border-bottom:1px solid #eee;padding:6px;text-align:center;">{s["count"]}</td>'
-                        aa_html += f'<td style="border-bottom:1px solid #eee;padding:6px;">{assessor_text}</td>'
-                        aa_html += f'<td style="border-bottom:1px solid #eee;padding:6px;text-align:center;">{s["findings_count"]}</td>'
-                        aa_html += f'<td style="border-bottom:1px solid #eee;padding:6px;text-align:center;">{comp_text}</td></tr>'
-
-                    aa_html += '</table>'
-
-                # Compliance by Yard Table
-                if aa['compliance_by_yard']:
-                    aa_html += f'<h3 style="color:{HTML_COLORS["secondary"]};margin:15px 0 8px 0;font-size:15px;">Compliance by Yard</h3>'
-                    aa_html += '<table width="100%" cellpadding="6" cellspacing="0" style="border-collapse:collapse;font-size:13px;margin-bottom:15px;">'
-                    aa_html += f'<tr style="background:{HTML_COLORS["secondary"]};color:#ffffff;">'
-                    aa_html += '<th style="text-align:left;padding:8px;">Yard</th>'
-                    aa_html += '<th style="text-align:center;padding:8px;">Total</th>'
-                    aa_html += '<th style="text-align:center;padding:8px;">Compliant</th>'
-                    aa_html += '<th style="text-align:center;padding:8px;">Non-Compliant</th>'
-                    aa_html += '<th style="text-align:center;padding:8px;">Status</th></tr>'
-
-                    sorted_yards = sorted(aa['compliance_by_yard'].items(),
-                                          key=lambda x: x[1]['non_compliant'], reverse=True)
-                    for i, (yard, info) in enumerate(sorted_yards):
-                        bg = '#f9f9f9' if i % 2 == 0 else '#ffffff'
-                        if info['total'] > 0:
-                            rate = info['compliant'] / info['total'] * 100
-                            if rate >= 90:
-                                status = f'<span style="color:{HTML_COLORS["safe"]};">&#9989; {rate:.0f}%</span>'
-                            elif rate >= 70:
-                                status = f'<span style="color:{HTML_COLORS["warning"]};">&#128993; {rate:.0f}%</span>'
-                            else:
-                                status = f'<span style="color:{HTML_COLORS["critical"]};">&#128308; {rate:.0f}%</span>'
-                        else:
-                            status = 'N/A'
-
-                        aa_html += f'<tr style="background:{bg};">'
-                        aa_html += f'<td style="border-bottom:1px solid #eee;padding:6px;">{_h(yard)}</td>'
-                        aa_html += f'<td style="border-bottom:1px solid #eee;padding:6px;text-align:center;">{info["total"]}</td>'
-                        aa_html += f'<td style="border-bottom:1px solid #eee;padding:6px;text-align:center;">{info["compliant"]}</td>'
-                        aa_html += f'<td style="border-bottom:1px solid #eee;padding:6px;text-align:center;">{info["non_compliant"]}</td>'
-                        aa_html += f'<td style="border-bottom:1px solid #eee;padding:6px;text-align:center;">{status}</td></tr>'
-
-                    aa_html += '</table>'
-
-                # Critical Findings
-                critical = aa['findings_by_severity']['critical']
-                high = aa['findings_by_severity']['high']
-                if critical or high:
-                    aa_html += f'<h3 style="color:{HTML_COLORS["critical"]};margin:15px 0 8px 0;font-size:15px;">Critical Findings - Immediate Attention</h3>'
-
-                    for f in critical:
-                        aa_html += f'<div style="background:#fff5f5;border-left:4px solid {HTML_COLORS["critical"]};padding:12px 15px;margin:8px 0;">'
-                        aa_html += f'<b style="color:{HTML_COLORS["critical"]};">&#128308; CRITICAL:</b> {_h(f["description"])}<br>'
-                        aa_html += f'Form: {_h(f["form_name"])} | Assessor: {_h(f["assessor"])} | Yard: {_h(f["yard"])}<br>'
-                        if f['link']:
-                            aa_html += f'<a href="{_h(f["link"])}">View in KPA</a>'
-                        aa_html += '</div>'
-
-                    for f in high[:5]:
-                        aa_html += f'<div style="background:#fffbf0;border-left:4px solid {HTML_COLORS["warning"]};padding:12px 15px;margin:8px 0;">'
-                        aa_html += f'<b style="color:{HTML_COLORS["warning"]};">&#128993; HIGH:</b> {_h(f["description"])}<br>'
-                        aa_html += f'Form: {_h(f["form_name"])} | Yard: {_h(f["yard"])}<br>'
-                        if f['link']:
-                            aa_html += f'<a href="{_h(f["link"])}">View in KPA</a>'
-                        aa_html += '</div>'
-
-                    if len(high) > 5:
-                        aa_html += f'<p style="font-style:italic;">... and {len(high) - 5} more high-severity findings</p>'
-                else:
-                    medium = aa['findings_by_severity']['medium']
-                    low = aa['findings_by_severity']['low']
-                    if medium or low:
-                        aa_html += f'<p><b>No critical or high-severity findings.</b> {len(medium)} medium, {len(low)} low-severity items noted.</p>'
-                    else:
-                        aa_html += f'<p style="color:{HTML_COLORS["safe"]};"><b>&#9989; No findings - All assessments passed!</b></p>'
-
-                # Top Assessors
-                if aa['assessor_stats']:
-                    aa_html += f'<h3 style="color:{HTML_COLORS["safe"]};margin:15px 0 8px 0;font-size:15px;">Top Performing Assessors</h3>'
-                    sorted_a = sorted(aa['assessor_stats'].items(), key=lambda x: x[1]['total'], reverse=True)
-                    rank = 0
-                    for name, stats in sorted_a[:10]:
-                        if name == 'Unknown':
-                            continue
-                        rank += 1
-                        star = '&#11088; ' if rank <= 3 else ''
-                        divs = ', '.join(stats['divisions']) if stats['divisions'] else 'N/A'
-                        finding_note = f' | {stats["findings_found"]} finding(s)' if stats['findings_found'] > 0 else ''
-                        aa_html += f'<div style="margin:4px 0 4px 15px;">{star}<b>{_h(name)}</b> - {stats["total"]} assessment(s) | {_h(divs)}{finding_note}</div>'
-
-                # Corrective Actions
-                if aa['corrective_actions']:
-                    aa_html += f'<h3 style="color:{HTML_COLORS["warning"]};margin:15px 0 8px 0;font-size:15px;">Corrective Actions ({len(aa["corrective_actions"])} open)</h3>'
-                    for i, ca in enumerate(aa['corrective_actions'][:5], 1):
-                        aa_html += f'<div style="background:#fffbf0;border-left:4px solid {HTML_COLORS["warning"]};padding:10px 15px;margin:6px 0;">'
-                        aa_html += f'<b>{i}. {_h(ca["description"])}</b><br>'
-                        aa_html += f'{_h(ca["form_name"])} | {_h(ca["yard"])} | By: {_h(ca["assessor"])}<br>'
-                        if ca['link']:
-                            aa_html += f'<a href="{_h(ca["link"])}">View in KPA</a>'
-                        aa_html += '</div>'
-                    if len(aa['corrective_actions']) > 5:
-                        aa_html += f'<p style="font-style:italic;">... and {len(aa["corrective_actions"]) - 5} more</p>'
-
-                # Trends
-                if aa['trends']:
-                    aa_html += f'<h3 style="color:{HTML_COLORS["primary"]};margin:15px 0 8px 0;font-size:15px;">Trends &amp; Patterns</h3>'
-                    aa_html += '<ul style="margin:5px 0;">'
-                    for trend in aa['trends']:
-                        aa_html += f'<li>&#128202; {_h(trend)}</li>'
-                    aa_html += '</ul>'
-
-                # Recommendations
-                recs = aa['recommendations']
-                if any([recs['immediate'], recs['this_week'], recs['monthly']]):
-                    aa_html += f'<h3 style="color:{HTML_COLORS["primary"]};margin:15px 0 8px 0;font-size:15px;">Recommended Actions for Leadership</h3>'
-
-                    if recs['immediate']:
-                        aa_html += f'<div style="margin:5px 0;"><b style="color:{HTML_COLORS["critical"]};">&#128308; IMMEDIATE:</b></div>'
-                        aa_html += '<ul style="margin:3px 0;">'
-                        for r in recs['immediate']:
-                            aa_html += f'<li>{_h(r)}</li>'
-                        aa_html += '</ul>'
-
-                    if recs['this_week']:
-                        aa_html += f'<div style="margin:5px 0;"><b style="color:{HTML_COLORS["warning"]};">&#128993; THIS WEEK:</b></div>'
-                        aa_html += '<ul style="margin:3px 0;">'
-                        for r in recs['this_week']:
-                            aa_html += f'<li>{_h(r)}</li>'
-                        aa_html += '</ul>'
-
-                    if recs['monthly']:
-                        aa_html += '<div style="margin:5px 0;"><b>&#128202; MONTH-OVER-MONTH:</b></div>'
-                        aa_html += '<ul style="margin:3px 0;">'
-                        for r in recs['monthly']:
-                            aa_html += f'<li>{_h(r)}</li>'
-                        aa_html += '</ul>'
-
-                sections.append(f"""
-<tr><td style="padding:25px 40px;border-top:3px solid {HTML_COLORS['primary']};">
-  <h2 style="color:{HTML_COLORS['primary']};margin:0 0 15px 0;font-size:18px;border-bottom:2px solid {HTML_COLORS['primary']};padding-bottom:5px;">ASSESSMENT &amp; AUDIT ANALYSIS</h2>
-  {aa_html}
-</td></tr>""")
-        except Exception as e:
-            print(f"Warning: HTML assessment analysis error: {e}")
+def _build_data_quality_section(obs_analysis):
+    """Observations filed under the wrong type, or '' when there are none"""
+    miscategorized = obs_analysis.get('miscategorized', []) if obs_analysis else []
+    if not miscategorized:
+        return ''
 
-    # --- AT-RISK CONDITIONS (top 10) ---
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        conditions = all_data['observation_analysis']['by_type'].get('At-Risk Condition', [])
-        if conditions:
-            display_count = min(10, len(conditions))
-            cond_html = ''
-            for i, cond in enumerate(conditions[:10], 1):
-                actual_name = get_actual_observer_name(cond)
-                corrective = cond.get('dpy2klalngsr7ek9', '')
-                if corrective and corrective.strip():
-                    status = f'<span style="color:{HTML_COLORS["safe"]};"><b>CORRECTED</b></span>'
-                else:
-                    status = f'<span style="color:{HTML_COLORS["warning"]};"><b>PENDING ACTION</b></span>'
-
-                cond_html += f'<div style="background:#fffbf0;border-left:4px solid {HTML_COLORS["warning"]};padding:12px 15px;margin:10px 0;">'
-                cond_html += f'<b>{i}. Report #{_h(cond.get("report number"))} - {_h(actual_name)}</b><br>'
-                cond_html += f'Date: {_h(cond.get("date", "N/A"))} | Location: {_h(cond.get("lg5pnj4chjadnv46", "N/A"))}<br>'
-                cond_html += f'Condition: {_h(cond.get("uncbcge9x8vow9pn", "No description"))}<br>'
-                cond_html += f'Status: {status}<br>'
-                link = cond.get('link', '')
-                if link and link != 'Link':
-                    cond_html += f'<a href="{_h(link)}">View in KPA</a><br>'
-                cond_html += '</div>'
-
-            if len(conditions) > 10:
-                cond_html += f'<p style="font-style:italic;">... and {len(conditions) - 10} more conditions in KPA</p>'
-
-            sections.append(f"""
-<tr><td style="padding:25px 40px;border-top:3px solid {HTML_COLORS['warning']};">
-  <h2 style="color:{HTML_COLORS['warning']};margin:0 0 15px 0;font-size:18px;">AT-RISK CONDITIONS (Top {display_count} of {len(conditions)})</h2>
-  {cond_html}
-</td></tr>""")
-
-    # --- RECOGNITION ---
-    if 'observation_analysis' in all_data and all_data['observation_analysis']:
-        recognition = all_data['observation_analysis']['by_type'].get('Recognition', [])
-        if recognition:
-            recognition_names = [{'name': get_actual_observer_name(rec), 'description': rec.get('uncbcge9x8vow9pn', '')} for rec in recognition]
-            name_counter = Counter([r['name'] for r in recognition_names])
-
-            rec_html = ''
-            for name, count in name_counter.most_common(10):
-                if name and name != 'Unknown':
-                    rec_html += f'<div style="background:#f0fff0;border-left:4px solid {HTML_COLORS["safe"]};padding:12px 15px;margin:10px 0;">'
-                    rec_html += f'<b style="color:{HTML_COLORS["safe"]};">&#9989; {_h(name)}</b> - {count} recognition(s)<br>'
-                    for rec in recognition_names:
-                        if rec['name'] == name:
-                            rec_html += f'<i>\'{_h(rec["description"])}\'</i><br>'
-                            break
-                    rec_html += '</div>'
+    h = _h
+    dq_html = ['<p>These observations were filed as the wrong type:</p>']
+    for item in miscategorized:
+        dq_html.append(_card('warning',
+            f'<b>Report #{h(item["report_num"])}</b><br>'
+            f'Current Type: {h(item["type"])} | Should Be: {h(item["actual_type"])}<br>'
+            f'Text: \'{h(item["description"])}\'<br>'
+            f'Person: {h(item["observer"])} | Action: Reclassify in KPA<br>'))
+
+    return HTML_DATA_QUALITY % (len(miscategorized), ''.join(dq_html))
 
-            sections.append(f"""
-<tr><td style="padding:25px 40px;border-top:3px solid {HTML_COLORS['safe']};">
-  <h2 style="color:{HTML_COLORS['safe']};margin:0 0 15px 0;font-size:18px;">SAFETY RECOGNITION - STARS ({len(recognition)})</h2>
-  {rec_html}
-</td></tr>""")
 
-    # --- ASSESSMENT & AUDIT SUMMARY (replaces old "Other Forms Summary") ---
+def _build_hotspot_section(obs_analysis):
+    """Top five observed people, or '' when nobody was observed"""
+    if not obs_analysis:
+        return ''
+    name_counts = obs_analysis['hotspot']
+    if not name_counts:
+        return ''
+
+    # hotspot only ever counts real names, so there is nothing to skip here
+    hotspot_html = ['<b>Most Active Observers:</b><ul style="margin:5px 0;">']
+    hotspot_html.extend(f'<li>{_h(name)}: {count} observations &#11088;</li>'
+                        for name, count in name_counts.most_common(5))
+    hotspot_html.append('</ul>')
+
+    return HTML_HOTSPOT % ''.join(hotspot_html)
+
+
+def _build_timing_section(obs_analysis):
+    """Observation counts per shift, or '' when no shift had any"""
+    if not obs_analysis:
+        return ''
+    active_shifts = {k: v for k, v in obs_analysis['shift_counts'].items() if v > 0}
+    if not active_shifts:
+        return ''
+
+    timing_html = ['<ul style="margin:5px 0;">']
+    for shift, count in active_shifts.items():
+        timing_html.append(f'<li>{_h(shift)}: {count} observations</li>')
+    timing_html.append('</ul>')
+
+    return HTML_TIMING % ''.join(timing_html)
+
+
+def _build_conditions_section(conditions):
+    """First ten at-risk conditions with their status, or '' when there were none"""
+    if not conditions:
+        return ''
+
+    h = _h
+
+    display_count = min(10, len(conditions))
+    cond_html = []
+    for i, cond in enumerate(islice(conditions, 10), 1):
+        actual_name = cond['_observer']
+        status = COND_STATUS[cond['_has_corrective']]
+
+        cond_html.append(_card('warning',
+            f'<b>{i}. Report #{h(cond.get("report number"))} - {h(actual_name)}</b><br>'
+            f'Date: {h(cond.get("date", "N/A"))} | Location: {h(cond.get("lg5pnj4chjadnv46", "N/A"))}<br>'
+            f'Condition: {h(cond.get("uncbcge9x8vow9pn", "No description"))}<br>'
+            f'Status: {status}<br>'
+            + _link_row(cond.get('link', ''), HTML_KPA_LINK)))
+
+    if len(conditions) > 10:
+        cond_html.append(f'<p style="font-style:italic;">... and {len(conditions) - 10} more conditions in KPA</p>')
+
+    return HTML_CONDITIONS % (display_count, len(conditions), ''.join(cond_html))
+
+
+def _build_recognition_section(obs_analysis):
+    """Most-recognized people with a sample quote, or '' when there was no recognition"""
+    recognition = obs_analysis['by_type'].get('Recognition', []) if obs_analysis else []
+    if not recognition:
+        return ''
+
+    title = CARD_TITLE['safe']
+    rec_html = [_card('safe', f'{title}&#9989; {_h(name)}</b> - {count} recognition(s)<br>'
+                              f'<i>\'{_h(desc)}\'</i><br>')
+                for name, count, desc in obs_analysis['recognition_top']]
+
+    return HTML_RECOGNITION % (len(recognition), ''.join(rec_html))
+
+
+def _build_audit_summary_section(all_data):
+    """Assessment & audit summary table, falling back to plain per-form counts"""
     if 'assessment_details' in all_data:
         try:
-            audit_table_html = build_assessment_html(all_data['assessment_details'])
+            return HTML_ASSESSMENT_SUMMARY % build_assessment_html(all_data['assessment_details'])
         except Exception as e:
             print(f"Warning: HTML assessment summary table error: {e}")
-            audit_table_html = ''
-            for form_id, form_name in OTHER_FORMS:
-                data = all_data.get(f"form_{form_id}")
-                count = data['count'] if data else 0
-                audit_table_html += f'<b>{_h(form_name)}:</b> {count}<br>'
-    else:
-        audit_table_html = ''
-        for form_id, form_name in OTHER_FORMS:
-            data = all_data.get(f"form_{form_id}")
-            count = data['count'] if data else 0
-            audit_table_html += f'<b>{_h(form_name)}:</b> {count}<br>'
 
-    sections.append(f"""
-<tr><td style="padding:25px 40px;border-top:2px solid #ddd;">
-  <h2 style="color:{HTML_COLORS['primary']};margin:0 0 15px 0;font-size:18px;border-bottom:2px solid {HTML_COLORS['primary']};padding-bottom:5px;">ASSESSMENT &amp; AUDIT SUMMARY</h2>
-  {audit_table_html}
-</td></tr>""")
+    audit_table_html = []
+    for form_id, form_name in OTHER_FORMS:
+        data = all_data.get(f"form_{form_id}")
+        count = data['count'] if data else 0
+        audit_table_html.append(f'<b>{_h(form_name)}:</b> {count}<br>')
 
-    # --- FOOTER ---
-    sections.append(f"""
-<tr><td style="background:{HTML_COLORS['secondary']};padding:20px 40px;text-align:center;">
-  <div style="color:#ffffff;font-size:11px;font-style:italic;">END OF REPORT</div>
-  <div style="color:#ffcccc;font-size:10px;margin-top:4px;">Butch's Rat Hole &amp; Anchor Service Inc. | HSE Department</div>
-</td></tr>""")
+    return HTML_ASSESSMENT_SUMMARY % ''.join(audit_table_html)
 
-    # --- Wrapper end ---
-    sections.append("""
-</table>
-</td></tr></table>
-</body></html>""")
 
-    return '\n'.join(sections)
+def build_html_report(all_data, yesterday_date):
+    """Build HTML version of the report for email body"""
+    # _parse_form_csv already dropped the 'Report Number' header-echo rows
+    incident_data = all_data.get('incident_reports')
+    real_incidents = incident_data['rows'] if incident_data else []
+    rca_data = all_data.get('rca')
+    real_rca = rca_data['rows'] if rca_data else []
+
+    obs_analysis = all_data.get('observation_analysis')
+    by_type = obs_analysis['by_type'] if obs_analysis else {}
+    near_misses = by_type.get('Near Miss', [])
+
+    assessment_section = ''
+    aa = all_data.get('assessment_analysis')
+    if aa:
+        try:
+            assessment_section = _build_assessment_section(aa)
+        except Exception as e:
+            print(f"Warning: HTML assessment analysis error: {e}")
+
+    # Optional sections come back as '' and are dropped
+    sections = [
+        HTML_WRAPPER_OPEN,
+        HTML_HEADER % (yesterday_date.strftime(REPORT_DATE_FMT), datetime.now().strftime(GENERATED_FMT)),
+        _build_streak_section(obs_analysis, real_incidents),
+        _build_summary_section(obs_analysis, real_incidents),
+        _build_actions_section(near_misses, by_type.get('At-Risk Behavior', []), real_incidents),
+        _build_incidents_section(real_incidents),
+        _build_rca_section(real_rca),
+        _build_near_miss_section(near_misses),
+        _build_open_items_section(obs_analysis),
+        _build_data_quality_section(obs_analysis),
+        _build_hotspot_section(obs_analysis),
+        _build_timing_section(obs_analysis),
+        assessment_section,
+        _build_conditions_section(by_type.get('At-Risk Condition', [])),
+        _build_recognition_section(obs_analysis),
+        _build_audit_summary_section(all_data),
+        HTML_FOOTER,
+        HTML_WRAPPER_CLOSE,
+    ]
+
+    return '\n'.join(section for section in sections if section)
 
 
 # ==============================================================================
 # SEND EMAIL
 # ==============================================================================
 
-def send_email_report(html_body, docx_path, yesterday_date):
-    """Send report via Gmail SMTP. Fails gracefully - prints error, does not crash."""
-    gmail_address = os.environ.get("GMAIL_ADDRESS", "")
-    gmail_app_password = os.environ.get("GMAIL_APP_PASSWORD", "")
-    recipient = os.environ.get("REPORT_RECIPIENT", "")
+def send_email_report(html_body, docx_path, yesterday_date, docx_bytes=None):
+    """Send report via Gmail SMTP. Fails gracefully - prints error, does not crash.
+
+    docx_bytes, when given, is attached as-is instead of re-reading docx_path.
+    """
+    gmail_address = GMAIL_ADDRESS
+    gmail_app_password = GMAIL_APP_PASSWORD
+    recipient = REPORT_RECIPIENT
 
     if not gmail_address or not gmail_app_password or not recipient:
         print("⚠️  Email skipped - GMAIL_ADDRESS, GMAIL_APP_PASSWORD, or REPORT_RECIPIENT not set.")
         return
 
+    # Only needed when actually sending, so runs without email creds skip the import
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    from email.mime.application import MIMEApplication
+
     subject = f"Daily Safety Report - {yesterday_date.strftime('%B %d, %Y')}"
 
     try:
@@ -2490,11 +2741,11 @@ def send_email_report(html_body, docx_path, yesterday_date):
         msg.attach(MIMEText(html_body, 'html'))
 
         # .docx attachment
-        if os.path.exists(docx_path):
+        if docx_bytes is None and os.path.exists(docx_path):
             with open(docx_path, 'rb') as f:
-                part = MIMEBase('application', 'vnd.openxmlformats-officedocument.wordprocessingml.document')
-                part.set_payload(f.read())
-            encoders.encode_base64(part)
+                docx_bytes = f.read()
+        if docx_bytes is not None:
+            part = MIMEApplication(docx_bytes, 'vnd.openxmlformats-officedocument.wordprocessingml.document')
             part.add_header('Content-Disposition', f'attachment; filename="{os.path.basename(docx_path)}"')
             msg.attach(part)
 
@@ -2518,7 +2769,7 @@ def main():
 
     print("\n" + "="*80)
     print("KPA DAILY SAFETY REPORT - AUTOMATED")
-    print(f"Report for: {yesterday.strftime('%A, %B %d, %Y')}")
+    print(f"Report for: {yesterday.strftime(REPORT_DATE_FMT)}")
     print("="*80)
     print("\n✓ Name field ONLY (actual observer, NOT James Barnett)")
     print("✓ Critical items first (Incidents, RCA, Near Misses)")
@@ -2532,9 +2783,9 @@ def main():
 
     print("Pulling data from KPA...\n")
 
-    for form_id, form_name in FORMS.items():
-        data = pull_form_data(form_id, form_name)
+    pulled = pull_all_forms(_yesterday_window(today))
 
+    for (form_id, form_name), data in zip(FORMS.items(), pulled):
         if form_id == 151085:
             obs_analysis = analyze_observations(data)
             all_data['observation_analysis'] = obs_analysis
@@ -2586,13 +2837,14 @@ def main():
         all_data['assessment_details'] = None
 
     print("\nGenerating report...")
-    doc = build_word_document(all_data, yesterday)
+    docx_bytes = build_word_document(all_data, yesterday, out=BytesIO()).getvalue()
 
     # Output to current working directory (works on both local and CI)
     date_str = yesterday.strftime('%Y-%m-%d')
     output_file = f"DailyKPAReport_{date_str}.docx"
 
-    doc.save(output_file)
+    with open(output_file, 'wb') as f:
+        f.write(docx_bytes)
 
     print(f"\n✅ Report saved: {output_file}")
     print(f"   Full path: {os.path.abspath(output_file)}")
@@ -2602,7 +2854,7 @@ def main():
     html_body = build_html_report(all_data, yesterday)
 
     print("Sending email...")
-    send_email_report(html_body, output_file, yesterday)
+    send_email_report(html_body, output_file, yesterday, docx_bytes=docx_bytes)
     print()
 
 if __name__ == "__main__":